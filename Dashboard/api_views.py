@@ -69,6 +69,10 @@ def _run_sync_in_background(
         logger.exception('Unexpected failure in sync background thread.')
 
 
+def _spawn(target, args, *, name: str) -> None:
+    threading.Thread(target=target, args=args, daemon=True, name=name).start()
+
+
 def _sync_belongs_to_user(sync_run: SyncRun, user_id: int) -> bool:
     owner_message = (
         SyncLog.objects.filter(sync_run=sync_run, entidade='sync_owner')
@@ -246,13 +250,11 @@ def _start_sync(
         ),
     )
 
-    thread = threading.Thread(
-        target=_run_sync_in_background,
-        args=(sync_run.id, dashboard_user.id, sync_scope, insights_days_override, instagram_account_id, date_start, date_end),
-        daemon=True,
+    _spawn(
+        _run_sync_in_background,
+        (sync_run.id, dashboard_user.id, sync_scope, insights_days_override, instagram_account_id, date_start, date_end),
         name=f'meta-sync-{sync_scope}-{sync_run.id}',
     )
-    thread.start()
 
     return Response(
         {
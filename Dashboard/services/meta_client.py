@@ -1,7 +1,7 @@
 import json
 import logging
-import math
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, Iterable, List, Optional
 from urllib.parse import parse_qs, urlparse
 
@@ -28,6 +28,7 @@ class MetaGraphClient:
         timeout_seconds: int = 30,
         max_retries: int = 5,
         batch_size: int = 20,
+        session: Optional[requests.Session] = None,
     ) -> None:
         if not access_token:
             raise ValueError('access_token is required')
@@ -44,7 +45,7 @@ class MetaGraphClient:
         self.timeout_seconds = timeout_seconds
         self.max_retries = max_retries
         self.batch_size = batch_size
-        self.session = requests.Session()
+        self.session = session or requests.Session()
 
     def request_with_retry(
         self,
@@ -182,6 +183,7 @@ class MetaGraphClient:
         entity: str = 'meta_batch',
         batch_size: Optional[int] = None,
         include_headers: bool = False,
+        max_workers: int = 1,
     ) -> List[Dict]:
         if not calls:
             self._log(entity, 'batch_request called with 0 calls.')
@@ -190,45 +192,76 @@ class MetaGraphClient:
         size = batch_size or self.batch_size
         if size < 1:
             raise ValueError('batch_size must be >= 1')
-
-        total_chunks = int(math.ceil(len(calls) / size))
-        aggregated_results: List[Dict] = []
-
-        for chunk_index, start in enumerate(range(0, len(calls), size), start=1):
-            chunk = calls[start : start + size]
-            self._log(
-                entity,
-                f'Batch chunk {chunk_index}/{total_chunks} with {len(chunk)} calls (chunk_size={size}).',
+        if max_workers < 1:
+            raise ValueError('max_workers must be >= 1')
+        if max_workers > 1 and self.sync_run is not None:
+            # _log writes SyncLog rows, which would open DB connections on pool threads that are never closed.
+            raise ValueError('max_workers > 1 is not supported with sync_run logging')
+
+        chunks = [calls[start : start + size] for start in range(0, len(calls), size)]
+        total_chunks = len(chunks)
+
+        def run_chunk(chunk_index: int, chunk: List[Dict]) -> List[Dict]:
+            return self._batch_chunk(
+                chunk,
+                chunk_index=chunk_index,
+                total_chunks=total_chunks,
+                size=size,
+                entity=entity,
+                include_headers=include_headers,
             )
-            try:
-                payload = self.request_with_retry(
-                    method='POST',
-                    path_or_url='/',
-                    data={
-                        'batch': json.dumps(chunk),
-                        'include_headers': 'true' if include_headers else 'false',
-                    },
-                    entity=entity,
-                )
-            except MetaClientError as exc:
-                self._log(entity, f'Batch chunk {chunk_index}/{total_chunks} failed: {exc}')
-                raise
 
-            if not isinstance(payload, list):
-                self._log(entity, 'Unexpected batch response format (expected list).')
-                raise MetaClientError('Unexpected batch response format.')
-
-            normalized = self._normalize_batch_results(payload)
-            errors = sum(1 for item in normalized if item['status_code'] >= 400)
-            self._log(
-                entity,
-                f'Batch chunk {chunk_index} completed with {len(normalized)} results and {errors} non-2xx.',
-            )
-            aggregated_results.extend(normalized)
+        if max_workers > 1 and total_chunks > 1:
+            # Chunks are independent POSTs; overlap their network waits and keep results in call order.
+            with ThreadPoolExecutor(max_workers=min(max_workers, total_chunks)) as executor:
+                chunk_results = list(executor.map(run_chunk, range(1, total_chunks + 1), chunks))
+        else:
+            chunk_results = [run_chunk(chunk_index, chunk) for chunk_index, chunk in enumerate(chunks, start=1)]
 
+        aggregated_results: List[Dict] = [item for normalized in chunk_results for item in normalized]
         self._log(entity, f'Batch processing finished with {len(aggregated_results)} total results.')
         return aggregated_results
 
+    def _batch_chunk(
+        self,
+        chunk: List[Dict],
+        *,
+        chunk_index: int,
+        total_chunks: int,
+        size: int,
+        entity: str,
+        include_headers: bool,
+    ) -> List[Dict]:
+        self._log(
+            entity,
+            f'Batch chunk {chunk_index}/{total_chunks} with {len(chunk)} calls (chunk_size={size}).',
+        )
+        try:
+            payload = self.request_with_retry(
+                method='POST',
+                path_or_url='/',
+                data={
+                    'batch': json.dumps(chunk),
+                    'include_headers': 'true' if include_headers else 'false',
+                },
+                entity=entity,
+            )
+        except MetaClientError as exc:
+            self._log(entity, f'Batch chunk {chunk_index}/{total_chunks} failed: {exc}')
+            raise
+
+        if not isinstance(payload, list):
+            self._log(entity, 'Unexpected batch response format (expected list).')
+            raise MetaClientError('Unexpected batch response format.')
+
+        normalized = self._normalize_batch_results(payload)
+        errors = sum(1 for item in normalized if item['status_code'] >= 400)
+        self._log(
+            entity,
+            f'Batch chunk {chunk_index} completed with {len(normalized)} results and {errors} non-2xx.',
+        )
+        return normalized
+
     def _build_url(self, path_or_url: str) -> str:
         candidate = (path_or_url or '').strip()
         if candidate.startswith('http://') or candidate.startswith('https://'):
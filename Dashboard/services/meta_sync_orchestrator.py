@@ -937,15 +937,17 @@ class MetaSyncOrchestrator:
             for entry in value:
                 if not isinstance(entry, dict):
                     continue
-                if isinstance(entry.get('values'), list):
-                    total += self._extract_results_list_value(entry.get('values'))
-                    continue
-                total += self._to_int(entry.get('value'))
+                entry_values = entry.get('values')
+                if isinstance(entry_values, list):
+                    total += self._extract_results_list_value(entry_values)
+                else:
+                    total += self._to_int(entry.get('value'))
             return total
 
         if isinstance(value, dict):
-            if isinstance(value.get('values'), list):
-                return self._extract_results_list_value(value.get('values'))
+            entry_values = value.get('values')
+            if isinstance(entry_values, list):
+                return self._extract_results_list_value(entry_values)
             return self._to_int(value.get('value'))
 
         return self._to_int(value)
@@ -1520,19 +1522,15 @@ class MetaSyncOrchestrator:
             if not isinstance(entry, dict):
                 continue
             name = entry.get('name')
-            values = entry.get('values') or []
+            if not name:
+                continue
+            raw_values = [v.get('value') for v in entry.get('values') or [] if isinstance(v, dict)]
             if name == 'ig_reels_avg_watch_time':
-                parsed_values = [self._to_decimal(v.get('value')) for v in values if isinstance(v, dict)]
-                parsed_values = [v for v in parsed_values if v is not None]
-                if not name or not parsed_values:
-                    continue
+                parsed_values = [self._to_decimal(raw) for raw in raw_values]
+            else:
+                parsed_values = [v for v in map(self._extract_metric_value, raw_values) if v is not None]
+            if parsed_values:
                 metric_values[name] = max(parsed_values)
-                continue
-            parsed_values = [self._extract_metric_value(v.get('value')) for v in values if isinstance(v, dict)]
-            parsed_values = [v for v in parsed_values if v is not None]
-            if not name or not parsed_values:
-                continue
-            metric_values[name] = max(parsed_values)
 
         updates = {}
         if 'reach' in metric_values:
@@ -1,3 +1,4 @@
+import copy
 import json
 from datetime import date, datetime, timedelta, timezone
 from unittest.mock import Mock, patch
@@ -5,7 +6,6 @@ from unittest.mock import Mock, patch
 import requests
 from django.contrib.auth import get_user_model
 from django.test import Client, TestCase
-from django.utils.dateparse import parse_date
 
 from Dashboard.models import (
     Ad,
@@ -24,12 +24,47 @@ from Dashboard.models import (
     SyncLog,
     SyncRun,
 )
+from Dashboard.api_views import _run_sync_in_background
 from Dashboard.services.meta_client import MetaClientError, MetaGraphClient
 from Dashboard.services.meta_sync_orchestrator import MetaSyncOrchestrator
 
 
 User = get_user_model()
 
+ITER_MONTH_CHUNKS_CASES = (
+    (
+        date(2026, 1, 1),
+        date(2026, 9, 15),
+        3,
+        [
+            (date(2026, 1, 1), date(2026, 3, 31)),
+            (date(2026, 4, 1), date(2026, 6, 30)),
+            (date(2026, 7, 1), date(2026, 9, 15)),
+        ],
+    ),
+    (
+        date(2026, 2, 1),
+        date(2026, 2, 28),
+        1,
+        [(date(2026, 2, 1), date(2026, 2, 28))],
+    ),
+    (
+        date(2025, 11, 1),
+        date(2026, 2, 15),
+        3,
+        [
+            (date(2025, 11, 1), date(2026, 1, 31)),
+            (date(2026, 2, 1), date(2026, 2, 15)),
+        ],
+    ),
+    (
+        date(2026, 5, 10),
+        date(2026, 5, 10),
+        3,
+        [(date(2026, 5, 10), date(2026, 5, 10))],
+    ),
+)
+
 
 class AuthSessionCsrfTests(TestCase):
     def setUp(self):
@@ -41,6 +76,7 @@ class AuthSessionCsrfTests(TestCase):
         me_response = client.get('/auth/me/')
         self.assertEqual(me_response.status_code, 200)
         self.assertIn('csrftoken', client.cookies)
+        csrf_token = client.cookies['csrftoken'].value
 
         no_csrf_login = client.post(
             '/auth/login/',
@@ -49,7 +85,6 @@ class AuthSessionCsrfTests(TestCase):
         )
         self.assertEqual(no_csrf_login.status_code, 403)
 
-        csrf_token = client.cookies['csrftoken'].value
         login_response = client.post(
             '/auth/login/',
             data=json.dumps({'username': 'alice', 'password': 'Secret123!'}),
@@ -64,8 +99,9 @@ class AuthSessionCsrfTests(TestCase):
         self.assertTrue(me_after_login.json()['authenticated'])
         self.assertEqual(me_after_login.json()['user']['username'], 'alice')
 
-        logout_csrf = client.cookies['csrftoken'].value
-        logout_response = client.post('/auth/logout/', HTTP_X_CSRFTOKEN=logout_csrf)
+        # login() rotates the CSRF secret, so the pre-login token is no longer valid.
+        csrf_token = client.cookies['csrftoken'].value
+        logout_response = client.post('/auth/logout/', HTTP_X_CSRFTOKEN=csrf_token)
         self.assertEqual(logout_response.status_code, 200)
         self.assertFalse(logout_response.json()['authenticated'])
 
@@ -73,6 +109,47 @@ class AuthSessionCsrfTests(TestCase):
         self.assertEqual(me_after_logout.status_code, 200)
         self.assertFalse(me_after_logout.json()['authenticated'])
 
+    def test_auth_me_returns_masked_csrf_token_per_response(self):
+        client = Client()
+        client.force_login(self.user)
+        client.get('/auth/me/')
+        secret = client.cookies['csrftoken'].value
+
+        first_token = client.get('/auth/me/').json()['csrfToken']
+        second_token = client.get('/auth/me/').json()['csrfToken']
+
+        self.assertNotEqual(first_token, secret)
+        self.assertNotEqual(first_token, second_token)
+
+    def test_auth_me_reflects_renamed_user(self):
+        client = Client()
+        client.force_login(self.user)
+        client.get('/auth/me/')
+
+        self.user.username = 'alice-renamed'
+        self.user.email = 'alice@example.com'
+        self.user.save(update_fields=['username', 'email'])
+
+        user_payload = client.get('/auth/me/').json()['user']
+        self.assertEqual(user_payload['username'], 'alice-renamed')
+        self.assertEqual(user_payload['email'], 'alice@example.com')
+
+    def test_auth_me_rejects_session_invalidated_by_password_change(self):
+        client = Client()
+        client.force_login(self.user)
+
+        first_response = client.get('/auth/me/')
+        self.assertTrue(first_response.json()['authenticated'])
+        self.assertEqual(first_response.json()['user']['username'], 'alice')
+
+        self.user.set_password('Changed456!')
+        self.user.save()
+
+        stale_response = client.get('/auth/me/')
+        self.assertEqual(stale_response.status_code, 200)
+        self.assertFalse(stale_response.json()['authenticated'])
+        self.assertIsNone(stale_response.json()['user'])
+
 
 class MetaConnectEndpointTests(TestCase):
     def setUp(self):
@@ -162,6 +239,33 @@ class MetaClientTests(TestCase):
         self.assertEqual([row['status_code'] for row in output], [200, 400, 200])
         self.assertEqual(mocked_request.call_count, 2)
 
+    def test_batch_request_with_workers_keeps_call_order(self):
+        client = MetaGraphClient(access_token='token-123', request_pause_seconds=0)
+        calls = [{'method': 'GET', 'relative_url': str(index)} for index in range(5)]
+
+        def fake_request(*, method, path_or_url, data, entity):
+            chunk = json.loads(data['batch'])
+            return [{'code': 200, 'body': json.dumps({'id': call['relative_url']})} for call in chunk]
+
+        with patch.object(client, 'request_with_retry', side_effect=fake_request) as mocked_request:
+            output = client.batch_request(calls, batch_size=2, max_workers=3)
+
+        self.assertEqual(mocked_request.call_count, 3)
+        self.assertEqual([row['body']['id'] for row in output], ['0', '1', '2', '3', '4'])
+
+    def test_batch_request_rejects_workers_with_sync_run_logging(self):
+        client = MetaGraphClient(
+            access_token='token-123',
+            request_pause_seconds=0,
+            sync_run=SyncRun.objects.create(status=SyncRun.Status.PENDING),
+        )
+
+        with patch.object(client, 'request_with_retry') as mocked_request:
+            with self.assertRaises(ValueError):
+                client.batch_request([{'method': 'GET', 'relative_url': 'x'}], max_workers=2)
+
+        mocked_request.assert_not_called()
+
 
 class InsightAggregationTests(TestCase):
     def setUp(self):
@@ -386,7 +490,8 @@ class MetaDashboardEndpointsTests(TestCase):
         )
 
     def test_meta_filters_returns_account_hierarchy(self):
-        response = self.client.get('/api/meta/filters')
+        with self.assertNumQueries(7):
+            response = self.client.get('/api/meta/filters')
         self.assertEqual(response.status_code, 200)
         payload = response.json()
         self.assertEqual(len(payload['ad_accounts']), 1)
@@ -407,7 +512,8 @@ class MetaDashboardEndpointsTests(TestCase):
             'date_start': '2026-01-01',
             'date_end': '2026-01-02',
         }
-        timeseries_response = self.client.get('/api/meta/timeseries', params)
+        with self.assertNumQueries(5):
+            timeseries_response = self.client.get('/api/meta/timeseries', params)
         self.assertEqual(timeseries_response.status_code, 200)
         series = timeseries_response.json()['series']
         self.assertEqual(len(series), 2)
@@ -415,7 +521,8 @@ class MetaDashboardEndpointsTests(TestCase):
         self.assertEqual(series[0]['results'], 5)
         self.assertEqual(series[1]['clicks'], 10)
 
-        kpi_response = self.client.get('/api/meta/kpis', params)
+        with self.assertNumQueries(6):
+            kpi_response = self.client.get('/api/meta/kpis', params)
         self.assertEqual(kpi_response.status_code, 200)
         kpis = kpi_response.json()['kpis']
         self.assertAlmostEqual(kpis['gasto_total'], 30.0, places=4)
@@ -987,24 +1094,21 @@ class MetaSyncStartScopeEndpointsTests(TestCase):
             name='perfil_sync',
         )
 
-    @patch('Dashboard.api_views.threading.Thread')
-    def test_meta_sync_start_meta_endpoint(self, mocked_thread):
-        mocked_thread.return_value = Mock()
-
+    @patch('Dashboard.api_views._spawn')
+    def test_meta_sync_start_meta_endpoint(self, mocked_spawn):
         response = self.client.post('/api/meta/sync/start/meta')
         self.assertEqual(response.status_code, 202)
         payload = response.json()
         self.assertEqual(payload['sync_scope'], 'meta')
 
-        args = mocked_thread.call_args.kwargs['args']
+        target, args = mocked_spawn.call_args.args
+        self.assertIs(target, _run_sync_in_background)
         self.assertEqual(args[1], self.dashboard_user.id)
         self.assertEqual(args[2], 'meta')
         self.assertIsNone(args[3])
 
-    @patch('Dashboard.api_views.threading.Thread')
-    def test_meta_sync_start_meta_accepts_custom_date_range(self, mocked_thread):
-        mocked_thread.return_value = Mock()
-
+    @patch('Dashboard.api_views._spawn')
+    def test_meta_sync_start_meta_accepts_custom_date_range(self, mocked_spawn):
         response = self.client.post(
             '/api/meta/sync/start/meta',
             data=json.dumps(
@@ -1021,7 +1125,8 @@ class MetaSyncStartScopeEndpointsTests(TestCase):
         self.assertEqual(payload['date_start'], '2026-02-01')
         self.assertEqual(payload['date_end'], '2026-02-10')
 
-        args = mocked_thread.call_args.kwargs['args']
+        target, args = mocked_spawn.call_args.args
+        self.assertIs(target, _run_sync_in_background)
         self.assertEqual(args[1], self.dashboard_user.id)
         self.assertEqual(args[2], 'meta')
         self.assertIsNone(args[3])
@@ -1029,10 +1134,8 @@ class MetaSyncStartScopeEndpointsTests(TestCase):
         self.assertEqual(args[5], date(2026, 2, 1))
         self.assertEqual(args[6], date(2026, 2, 10))
 
-    @patch('Dashboard.api_views.threading.Thread')
-    def test_meta_sync_start_meta_rejects_incomplete_custom_date_range(self, mocked_thread):
-        mocked_thread.return_value = Mock()
-
+    @patch('Dashboard.api_views._spawn')
+    def test_meta_sync_start_meta_rejects_incomplete_custom_date_range(self, mocked_spawn):
         response = self.client.post(
             '/api/meta/sync/start/meta',
             data=json.dumps(
@@ -1047,56 +1150,51 @@ class MetaSyncStartScopeEndpointsTests(TestCase):
             response.json()['detail'],
             'Informe data inicial e data final para usar um periodo personalizado.',
         )
-        mocked_thread.assert_not_called()
-
-    @patch('Dashboard.api_views.threading.Thread')
-    def test_meta_sync_start_instagram_endpoint(self, mocked_thread):
-        mocked_thread.return_value = Mock()
+        mocked_spawn.assert_not_called()
 
+    @patch('Dashboard.api_views._spawn')
+    def test_meta_sync_start_instagram_endpoint(self, mocked_spawn):
         response = self.client.post('/api/meta/sync/start/instagram')
         self.assertEqual(response.status_code, 202)
         payload = response.json()
         self.assertEqual(payload['sync_scope'], 'instagram')
 
-        args = mocked_thread.call_args.kwargs['args']
+        target, args = mocked_spawn.call_args.args
+        self.assertIs(target, _run_sync_in_background)
         self.assertEqual(args[1], self.dashboard_user.id)
         self.assertEqual(args[2], 'instagram')
         self.assertIsNone(args[3])
 
-    @patch('Dashboard.api_views.threading.Thread')
-    def test_meta_sync_start_insights_7d_endpoint(self, mocked_thread):
-        mocked_thread.return_value = Mock()
-
+    @patch('Dashboard.api_views._spawn')
+    def test_meta_sync_start_insights_7d_endpoint(self, mocked_spawn):
         response = self.client.post('/api/meta/sync/start/insights-7d')
         self.assertEqual(response.status_code, 202)
         payload = response.json()
         self.assertEqual(payload['sync_scope'], 'all')
         self.assertEqual(payload['insights_days_override'], 7)
 
-        args = mocked_thread.call_args.kwargs['args']
+        target, args = mocked_spawn.call_args.args
+        self.assertIs(target, _run_sync_in_background)
         self.assertEqual(args[1], self.dashboard_user.id)
         self.assertEqual(args[2], 'all')
         self.assertEqual(args[3], 7)
 
-    @patch('Dashboard.api_views.threading.Thread')
-    def test_meta_sync_start_insights_1d_endpoint(self, mocked_thread):
-        mocked_thread.return_value = Mock()
-
+    @patch('Dashboard.api_views._spawn')
+    def test_meta_sync_start_insights_1d_endpoint(self, mocked_spawn):
         response = self.client.post('/api/meta/sync/start/insights-1d')
         self.assertEqual(response.status_code, 202)
         payload = response.json()
         self.assertEqual(payload['sync_scope'], 'meta')
         self.assertEqual(payload['insights_days_override'], 1)
 
-        args = mocked_thread.call_args.kwargs['args']
+        target, args = mocked_spawn.call_args.args
+        self.assertIs(target, _run_sync_in_background)
         self.assertEqual(args[1], self.dashboard_user.id)
         self.assertEqual(args[2], 'meta')
         self.assertEqual(args[3], 1)
 
-    @patch('Dashboard.api_views.threading.Thread')
-    def test_instagram_sync_selected_endpoint(self, mocked_thread):
-        mocked_thread.return_value = Mock()
-
+    @patch('Dashboard.api_views._spawn')
+    def test_instagram_sync_selected_endpoint(self, mocked_spawn):
         response = self.client.post(
             '/api/instagram/sync-selected',
             data=json.dumps(
@@ -1115,7 +1213,8 @@ class MetaSyncStartScopeEndpointsTests(TestCase):
         self.assertEqual(payload['date_start'], '2026-02-01')
         self.assertEqual(payload['date_end'], '2026-02-10')
 
-        args = mocked_thread.call_args.kwargs['args']
+        target, args = mocked_spawn.call_args.args
+        self.assertIs(target, _run_sync_in_background)
         self.assertEqual(args[1], self.dashboard_user.id)
         self.assertEqual(args[2], 'instagram')
         self.assertIsNone(args[3])
@@ -1241,8 +1340,13 @@ class MetaBatchEntityExtractionTests(TestCase):
 
 
 class MetaSyncOrchestratorPathTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.orchestrator_template = MetaSyncOrchestrator(sync_run_id=1, dashboard_user_id=1)
+
     def test_ad_account_edge_path_does_not_duplicate_act_prefix(self):
-        orchestrator = MetaSyncOrchestrator(sync_run_id=1, dashboard_user_id=1)
+        orchestrator = copy.copy(self.orchestrator_template)
         self.assertEqual(
             orchestrator._ad_account_edge_path('act_356273767805669', 'ads'),
             'act_356273767805669/ads',
@@ -1253,16 +1357,13 @@ class MetaSyncOrchestratorPathTests(TestCase):
         )
 
     def test_iter_month_chunks_quarterly(self):
-        orchestrator = MetaSyncOrchestrator(sync_run_id=1, dashboard_user_id=1)
-        chunks = list(orchestrator._iter_month_chunks(date(2026, 1, 1), date(2026, 9, 15), chunk_months=3))
-        self.assertEqual(
-            chunks,
-            [
-                (date(2026, 1, 1), date(2026, 3, 31)),
-                (date(2026, 4, 1), date(2026, 6, 30)),
-                (date(2026, 7, 1), date(2026, 9, 15)),
-            ],
-        )
+        orchestrator = copy.copy(self.orchestrator_template)
+        for since, until, chunk_months, expected in ITER_MONTH_CHUNKS_CASES:
+            with self.subTest(since=since, until=until, chunk_months=chunk_months):
+                self.assertEqual(
+                    list(orchestrator._iter_month_chunks(since, until, chunk_months=chunk_months)),
+                    expected,
+                )
 
     @patch('Dashboard.services.meta_sync_orchestrator.timezone.localdate', return_value=date(2026, 2, 23))
     def test_build_date_window_with_insights_days_override(self, _mocked_today):
@@ -1286,7 +1387,7 @@ class MetaSyncOrchestratorPathTests(TestCase):
 
     @patch('Dashboard.services.meta_sync_orchestrator.timezone.localdate', return_value=date(2026, 2, 20))
     def test_fetch_instagram_account_insights_clamps_since_to_two_years(self, _mocked_today):
-        orchestrator = MetaSyncOrchestrator(sync_run_id=1, dashboard_user_id=1)
+        orchestrator = copy.copy(self.orchestrator_template)
         orchestrator.client = Mock()
         orchestrator.client.request_with_retry.return_value = {'data': []}
 
@@ -1301,15 +1402,13 @@ class MetaSyncOrchestratorPathTests(TestCase):
         self.assertTrue(orchestrator.client.request_with_retry.call_count > 1)
         for call in orchestrator.client.request_with_retry.call_args_list:
             params = call.kwargs['params']
-            since_value = parse_date(params['since'])
-            until_value = parse_date(params['until'])
-            self.assertIsNotNone(since_value)
-            self.assertIsNotNone(until_value)
+            since_value = date.fromisoformat(params['since'])
+            until_value = date.fromisoformat(params['until'])
             self.assertLessEqual((until_value - since_value).days, 29)
 
     @patch('Dashboard.services.meta_sync_orchestrator.timezone.localdate', return_value=date(2026, 2, 20))
     def test_fetch_instagram_account_insights_uses_metric_type_total_value(self, _mocked_today):
-        orchestrator = MetaSyncOrchestrator(sync_run_id=1, dashboard_user_id=1)
+        orchestrator = copy.copy(self.orchestrator_template)
         orchestrator.client = Mock()
         orchestrator.client.request_with_retry.return_value = {'data': []}
 
@@ -1324,7 +1423,7 @@ class MetaSyncOrchestratorPathTests(TestCase):
 
     @patch('Dashboard.services.meta_sync_orchestrator.timezone.localdate', return_value=date(2026, 2, 20))
     def test_fetch_instagram_account_insights_requests_impressions_metric(self, _mocked_today):
-        orchestrator = MetaSyncOrchestrator(sync_run_id=1, dashboard_user_id=1)
+        orchestrator = copy.copy(self.orchestrator_template)
         orchestrator.client = Mock()
         orchestrator.client.request_with_retry.return_value = {'data': []}
 
@@ -1341,7 +1440,7 @@ class MetaSyncOrchestratorPathTests(TestCase):
     def test_fetch_instagram_account_insights_limits_follower_count_to_last_30_days_excluding_today(
         self, _mocked_today
     ):
-        orchestrator = MetaSyncOrchestrator(sync_run_id=1, dashboard_user_id=1)
+        orchestrator = copy.copy(self.orchestrator_template)
         orchestrator.client = Mock()
         orchestrator.client.request_with_retry.return_value = {'data': []}
 
@@ -1362,7 +1461,7 @@ class MetaSyncOrchestratorPathTests(TestCase):
 
     @patch('Dashboard.services.meta_sync_orchestrator.timezone.localdate', return_value=date(2026, 2, 20))
     def test_fetch_instagram_account_insights_skips_when_window_is_outside_limit(self, _mocked_today):
-        orchestrator = MetaSyncOrchestrator(sync_run_id=1, dashboard_user_id=1)
+        orchestrator = copy.copy(self.orchestrator_template)
         orchestrator.client = Mock()
         orchestrator.client.request_with_retry.return_value = {'data': []}
 
@@ -1380,7 +1479,7 @@ class MetaSyncOrchestratorPathTests(TestCase):
         self.assertEqual(follower_params[0]['until'], '2026-02-18')
 
     def test_extract_results_value_reads_nested_values_list(self):
-        orchestrator = MetaSyncOrchestrator(sync_run_id=1, dashboard_user_id=1)
+        orchestrator = copy.copy(self.orchestrator_template)
         value = orchestrator._extract_results_value(
             [
                 {
@@ -1399,7 +1498,7 @@ class MetaSyncOrchestratorPathTests(TestCase):
         self.assertEqual(value, 5)
 
     def test_extract_batch_error_message_prefers_meta_error_message(self):
-        orchestrator = MetaSyncOrchestrator(sync_run_id=1, dashboard_user_id=1)
+        orchestrator = copy.copy(self.orchestrator_template)
         message = orchestrator._extract_batch_error_message(
             {
                 'status_code': 400,
@@ -1410,7 +1509,7 @@ class MetaSyncOrchestratorPathTests(TestCase):
         self.assertEqual(message, 'Unsupported get request')
 
     def test_parse_instagram_account_insights_maps_reach_and_views(self):
-        orchestrator = MetaSyncOrchestrator(sync_run_id=1, dashboard_user_id=1)
+        orchestrator = copy.copy(self.orchestrator_template)
         payload = {
             'data': [
                 {'name': 'reach', 'values': [{'value': '120'}]},
@@ -1433,7 +1532,7 @@ class MetaSyncOrchestratorPathTests(TestCase):
         self.assertEqual(updates['follows_and_unfollows'], 5)
 
     def test_parse_instagram_account_insights_prefers_impressions_metric(self):
-        orchestrator = MetaSyncOrchestrator(sync_run_id=1, dashboard_user_id=1)
+        orchestrator = copy.copy(self.orchestrator_template)
         payload = {
             'data': [
                 {
@@ -1464,7 +1563,7 @@ class MetaSyncOrchestratorPathTests(TestCase):
         self.assertEqual(points[0]['impressions'], 410)
 
     def test_parse_instagram_account_insights_uses_latest_follower_count_by_date(self):
-        orchestrator = MetaSyncOrchestrator(sync_run_id=1, dashboard_user_id=1)
+        orchestrator = copy.copy(self.orchestrator_template)
         payload = {
             'data': [
                 {
@@ -1482,7 +1581,7 @@ class MetaSyncOrchestratorPathTests(TestCase):
         self.assertEqual(updates['follower_count'], 710)
 
     def test_fetch_instagram_current_followers_count_reads_graph_field(self):
-        orchestrator = MetaSyncOrchestrator(sync_run_id=1, dashboard_user_id=1)
+        orchestrator = copy.copy(self.orchestrator_template)
         orchestrator.client = Mock()
         orchestrator.client.request_with_retry.return_value = {'followers_count': 1234}
 
@@ -1493,7 +1592,7 @@ class MetaSyncOrchestratorPathTests(TestCase):
         self.assertEqual(params['fields'], 'followers_count')
 
     def test_media_metrics_for_type_uses_supported_metrics(self):
-        orchestrator = MetaSyncOrchestrator(sync_run_id=1, dashboard_user_id=1)
+        orchestrator = copy.copy(self.orchestrator_template)
         reel_metrics = orchestrator._media_metrics_for_type('REEL')
         video_metrics = orchestrator._media_metrics_for_type('VIDEO')
 
@@ -1503,7 +1602,7 @@ class MetaSyncOrchestratorPathTests(TestCase):
         self.assertNotIn('video_views', video_metrics)
 
     def test_parse_media_insights_maps_video_views_and_reels_watch_time(self):
-        orchestrator = MetaSyncOrchestrator(sync_run_id=1, dashboard_user_id=1)
+        orchestrator = copy.copy(self.orchestrator_template)
         updates = orchestrator._parse_media_insights(
             [
                 {'name': 'video_views', 'values': [{'value': '91'}]},
@@ -1517,7 +1616,7 @@ class MetaSyncOrchestratorPathTests(TestCase):
         self.assertAlmostEqual(float(updates['avg_watch_time']), 12.7, places=4)
 
     def test_parse_instagram_account_daily_insights_maps_per_day(self):
-        orchestrator = MetaSyncOrchestrator(sync_run_id=1, dashboard_user_id=1)
+        orchestrator = copy.copy(self.orchestrator_template)
         payload = {
             'data': [
                 {
@@ -1580,7 +1679,7 @@ class MetaSyncOrchestratorPathTests(TestCase):
         )
 
     def test_parse_instagram_account_daily_insights_supports_total_value_and_date_range(self):
-        orchestrator = MetaSyncOrchestrator(sync_run_id=1, dashboard_user_id=1)
+        orchestrator = copy.copy(self.orchestrator_template)
         payload = {
             'data': [
                 {
@@ -1658,7 +1757,7 @@ class MetaSyncOrchestratorPathTests(TestCase):
         self.assertEqual(updates['total_interactions'], 151)
 
     def test_extract_follow_net_change_supports_follow_type_breakdown(self):
-        orchestrator = MetaSyncOrchestrator(sync_run_id=1, dashboard_user_id=1)
+        orchestrator = copy.copy(self.orchestrator_template)
         value = {
             'total_value': {
                 'breakdowns': [
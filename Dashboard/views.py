@@ -1,21 +1,35 @@
 import json
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency during local checks
+    orjson = None
+
 from django.contrib.auth import authenticate, login, logout
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.middleware.csrf import get_token
 from django.views.decorators.csrf import csrf_protect, ensure_csrf_cookie
 from django.views.decorators.http import require_GET, require_POST
 
 
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _json(payload, status=200):
+    if orjson is None:
+        return JsonResponse(payload, status=status)
+    return HttpResponse(orjson.dumps(payload), status=status, content_type='application/json')
+
+
 @ensure_csrf_cookie
 @require_GET
 def auth_me(request):
     csrf_token = get_token(request)
 
     if not request.user.is_authenticated:
-        return JsonResponse({'authenticated': False, 'user': None, 'csrfToken': csrf_token}, status=200)
+        return _json({'authenticated': False, 'user': None, 'csrfToken': csrf_token}, status=200)
 
-    return JsonResponse(
+    return _json(
         {
             'authenticated': True,
             'csrfToken': csrf_token,
@@ -33,22 +47,22 @@ def auth_me(request):
 @require_POST
 def auth_login(request):
     try:
-        payload = json.loads(request.body or '{}')
+        payload = _json_loads(request.body or b'{}')
     except json.JSONDecodeError:
-        return JsonResponse({'detail': 'JSON invalido.'}, status=400)
+        return _json({'detail': 'JSON invalido.'}, status=400)
 
     username = (payload.get('username') or '').strip()
     password = payload.get('password') or ''
 
     if not username or not password:
-        return JsonResponse({'detail': 'username e password sao obrigatorios.'}, status=400)
+        return _json({'detail': 'username e password sao obrigatorios.'}, status=400)
 
     user = authenticate(request, username=username, password=password)
     if user is None:
-        return JsonResponse({'detail': 'Credenciais invalidas.'}, status=401)
+        return _json({'detail': 'Credenciais invalidas.'}, status=401)
 
     login(request, user)
-    return JsonResponse(
+    return _json(
         {
             'authenticated': True,
             'user': {
@@ -66,4 +80,4 @@ def auth_login(request):
 def auth_logout(request):
     if request.user.is_authenticated:
         logout(request)
-    return JsonResponse({'authenticated': False}, status=200)
+    return _json({'authenticated': False}, status=200)
@@ -161,6 +161,18 @@ DATABASES = {
     'default': default_database,
 }
 
+redis_url = str(os.getenv('REDIS_URL', '') or '').strip()
+if redis_url:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': redis_url,
+        },
+    }
+    # Session reads come from Redis; cached_db still writes through so logins survive a cache flush.
+    SESSION_ENGINE = os.getenv('SESSION_ENGINE', 'django.contrib.sessions.backends.cached_db')
+    SESSION_CACHE_ALIAS = 'default'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
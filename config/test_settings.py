@@ -7,3 +7,21 @@ DATABASES = {
         'NAME': BASE_DIR / 'test.sqlite3',
     }
 }
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+
+class DisableMigrations:
+    # Build test tables straight from the current models instead of replaying migrations.
+    def __contains__(self, item):
+        return True
+
+    def __getitem__(self, item):
+        return None
+
+
+MIGRATION_MODULES = DisableMigrations()
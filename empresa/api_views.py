@@ -1,42 +1,65 @@
 import logging
 from decimal import Decimal, InvalidOperation
 
+from django.http import StreamingHttpResponse
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
 
 from Dashboard.models import AdAccount, DashboardUser
 
 from .models import Cliente
 from .meta_funding_service import sync_clientes_saldo_atual_from_meta
+from .renderers import ORJSONRenderer, render_json_bytes
 
 
 logger = logging.getLogger(__name__)
 
+CLIENTES_STREAM_THRESHOLD = 500
+CLIENTES_STREAM_CHUNK_SIZE = 500
+
+_FORMA_PAGAMENTO_VALID = frozenset({Cliente.FORMA_PAGAMENTO_PIX, Cliente.FORMA_PAGAMENTO_CARTAO_CREDITO})
+_PERIODO_COBRANCA_VALID = frozenset({Cliente.PERIODO_COBRANCA_SEMANAL, Cliente.PERIODO_COBRANCA_MENSAL})
+_ESTADO_VALID = frozenset({Cliente.ESTADO_MAU, Cliente.ESTADO_REGULAR, Cliente.ESTADO_BOM})
+
+
+def _sync_saldo_result(user) -> dict:
+    try:
+        return sync_clientes_saldo_atual_from_meta(user)
+    except Exception:
+        logger.exception('Falha inesperada ao sincronizar saldo_atual dos clientes.')
+        return {
+            'updated_clientes': 0,
+            'total_clientes': 0,
+            'total_ad_accounts': 0,
+            'error_count': 1,
+            'parse_error_count': 0,
+            'skipped': False,
+            'detail': 'Falha inesperada ao sincronizar saldo_atual.',
+        }
+
 
 def _ad_accounts_for_user(user):
     dashboard_user = DashboardUser.objects.filter(user=user).first()
     return AdAccount.objects.accessible_to(dashboard_user)
 
 
+_IDS_PARAM_BYTES = frozenset(b'0123456789,')
+
+
 def _parse_ids_param(raw_ids: str):
-    values = []
-    seen = set()
-    for chunk in raw_ids.split(','):
-        item = chunk.strip()
-        if not item:
-            continue
-        if not item.isdigit():
+    if frozenset(raw_ids.encode()) <= _IDS_PARAM_BYTES:
+        items = raw_ids.split(',')
+    else:
+        items = [chunk.strip() for chunk in raw_ids.split(',')]
+        if not all(item.isascii() and item.isdigit() for item in items if item):
             return None
-        parsed = int(item)
-        if parsed <= 0:
-            return None
-        if parsed in seen:
-            continue
-        seen.add(parsed)
-        values.append(parsed)
-    return values
+    values = [int(item) for item in items if item]
+    if not all(values):
+        return None
+    return list(dict.fromkeys(values))
 
 
 def _parse_decimal_field(raw_value, field_name: str):
@@ -53,83 +76,108 @@ def _parse_decimal_field(raw_value, field_name: str):
 
 def _parse_forma_pagamento(raw_value):
     value = str(raw_value or '').strip().upper()
-    valid_values = {
-        Cliente.FORMA_PAGAMENTO_PIX,
-        Cliente.FORMA_PAGAMENTO_CARTAO_CREDITO,
-    }
-    if value not in valid_values:
+    if value not in _FORMA_PAGAMENTO_VALID:
         return None, 'Campo forma_pagamento invalido. Valores permitidos: PIX, CARTAO CREDITO.'
     return value, None
 
 
 def _parse_periodo_cobranca(raw_value):
     value = str(raw_value or '').strip().upper()
-    valid_values = {
-        Cliente.PERIODO_COBRANCA_SEMANAL,
-        Cliente.PERIODO_COBRANCA_MENSAL,
-    }
-    if value not in valid_values:
+    if value not in _PERIODO_COBRANCA_VALID:
         return None, 'Campo periodo_cobranca invalido. Valores permitidos: SEMANAL, MENSAL.'
     return value, None
 
 
 def _parse_estado(raw_value):
     value = str(raw_value or '').strip().upper()
-    valid_values = {
-        Cliente.ESTADO_MAU,
-        Cliente.ESTADO_REGULAR,
-        Cliente.ESTADO_BOM,
-    }
-    if value not in valid_values:
+    if value not in _ESTADO_VALID:
         return None, 'Campo estado invalido. Valores permitidos: MAU, REGULAR, BOM.'
     return value, None
 
 
-def _serialize_cliente(cliente: Cliente) -> dict:
+_CLIENTE_VALUE_FIELDS = (
+    'id',
+    'name',
+    'estado',
+    'descricao_estado',
+    'nicho_atuacao',
+    'valor_investido',
+    'forma_pagamento',
+    'periodo_cobranca',
+    'saldo_atual',
+    'gasto_diario',
+    'nome_id',
+    'nome__name',
+    'nome__id_meta_ad_account',
+    'data_renovacao_creditos',
+    'created_at',
+    'updated_at',
+)
+
+
+# Every Cliente column is needed for the response; only the joined AdAccount is narrowed.
+_CLIENTE_DETAIL_ONLY_FIELDS = (
+    *(field.name for field in Cliente._meta.concrete_fields),
+    'nome__name',
+    'nome__id_meta_ad_account',
+)
+_AD_ACCOUNT_ONLY_FIELDS = ('id', 'name', 'id_meta_ad_account')
+
+
+def _serialize_cliente_row(row: dict) -> dict:
     return {
-        'id': cliente.id,
-        'name': cliente.name,
-        'estado': cliente.estado,
-        'descricao_estado': cliente.descricao_estado,
-        'nicho_atuacao': cliente.nicho_atuacao,
-        'valor_investido': cliente.valor_investido,
-        'forma_pagamento': cliente.forma_pagamento,
-        'periodo_cobranca': cliente.periodo_cobranca,
-        'saldo_atual': cliente.saldo_atual,
-        'gasto_diario': cliente.gasto_diario,
-        'nome_id': cliente.nome_id,
-        'nome': cliente.nome.name,
-        'id_meta_ad_account': cliente.nome.id_meta_ad_account,
-        'data_renovacao_creditos': cliente.data_renovacao_creditos,
-        'created_at': cliente.created_at,
-        'updated_at': cliente.updated_at,
+        'id': row['id'],
+        'name': row['name'],
+        'estado': row['estado'],
+        'descricao_estado': row['descricao_estado'],
+        'nicho_atuacao': row['nicho_atuacao'],
+        'valor_investido': row['valor_investido'],
+        'forma_pagamento': row['forma_pagamento'],
+        'periodo_cobranca': row['periodo_cobranca'],
+        'saldo_atual': row['saldo_atual'],
+        'gasto_diario': row['gasto_diario'],
+        'nome_id': row['nome_id'],
+        'nome': row['nome__name'],
+        'id_meta_ad_account': row['nome__id_meta_ad_account'],
+        'data_renovacao_creditos': row['data_renovacao_creditos'],
+        'created_at': row['created_at'],
+        'updated_at': row['updated_at'],
     }
 
 
+def _serialize_cliente(cliente: Cliente) -> dict:
+    # Builds the same row shape values(*_CLIENTE_VALUE_FIELDS) returns, so both paths share one wire format.
+    row = {field: getattr(cliente, field) for field in _CLIENTE_VALUE_FIELDS if not field.startswith('nome__')}
+    row['nome__name'] = cliente.nome.name
+    row['nome__id_meta_ad_account'] = cliente.nome.id_meta_ad_account
+    return _serialize_cliente_row(row)
+
+
+def _stream_clientes(queryset, saldo_sync):
+    yield b'{"clientes":['
+    total = 0
+    for row in queryset.values(*_CLIENTE_VALUE_FIELDS).iterator(chunk_size=CLIENTES_STREAM_CHUNK_SIZE):
+        chunk = render_json_bytes(_serialize_cliente_row(row))
+        yield chunk if total == 0 else b',' + chunk
+        total += 1
+    tail = {'total': total}
+    if saldo_sync is not None:
+        tail['saldo_sync'] = saldo_sync
+    # Reuse the rendered object body after its opening brace for the trailing keys.
+    yield b'],' + render_json_bytes(tail)[1:]
+
+
 @api_view(['GET', 'POST', 'DELETE'])
 @permission_classes([IsAuthenticated])
+@renderer_classes([ORJSONRenderer, BrowsableAPIRenderer])
 def clientes(request):
     if request.method == 'GET':
         refresh_saldo_raw = str(request.query_params.get('refresh_saldo') or '').strip().lower()
         should_refresh_saldo = refresh_saldo_raw in {'1', 'true', 'yes'}
-        saldo_sync = None
-        if should_refresh_saldo:
-            try:
-                saldo_sync = sync_clientes_saldo_atual_from_meta(request.user)
-            except Exception:
-                logger.exception('Falha inesperada ao sincronizar saldo_atual dos clientes.')
-                saldo_sync = {
-                    'updated_clientes': 0,
-                    'total_clientes': 0,
-                    'total_ad_accounts': 0,
-                    'error_count': 1,
-                    'parse_error_count': 0,
-                    'skipped': False,
-                    'detail': 'Falha inesperada ao sincronizar saldo_atual.',
-                }
+        saldo_sync = _sync_saldo_result(request.user) if should_refresh_saldo else None
 
         accessible_ad_accounts = _ad_accounts_for_user(request.user)
-        queryset = Cliente.objects.select_related('nome').filter(nome__in=accessible_ad_accounts).order_by('-created_at')
+        queryset = Cliente.objects.filter(nome__in=accessible_ad_accounts).order_by('-created_at')
         raw_ids = str(request.query_params.get('ids') or '').strip()
         if raw_ids:
             parsed_ids = _parse_ids_param(raw_ids)
@@ -140,7 +188,16 @@ def clientes(request):
                 )
             queryset = queryset.filter(id__in=parsed_ids)
 
-        payload = [_serialize_cliente(cliente) for cliente in queryset]
+        # A full first slice decides streaming without a separate COUNT(*); only large listings re-read.
+        rows = list(queryset.values(*_CLIENTE_VALUE_FIELDS)[:CLIENTES_STREAM_THRESHOLD])
+        if len(rows) >= CLIENTES_STREAM_THRESHOLD:
+            return StreamingHttpResponse(
+                _stream_clientes(queryset, saldo_sync),
+                status=status.HTTP_200_OK,
+                content_type='application/json',
+            )
+
+        payload = [_serialize_cliente_row(row) for row in rows]
         response_payload = {'clientes': payload, 'total': len(payload)}
         if saldo_sync is not None:
             response_payload['saldo_sync'] = saldo_sync
@@ -196,7 +253,9 @@ def clientes(request):
             status=status.HTTP_400_BAD_REQUEST,
         )
 
-    ad_account = _ad_accounts_for_user(request.user).filter(id=ad_account_id).first()
+    ad_account = (
+        _ad_accounts_for_user(request.user).only(*_AD_ACCOUNT_ONLY_FIELDS).filter(id=ad_account_id).first()
+    )
     if ad_account is None:
         return Response(
             {'detail': 'AdAccount nao encontrado para o usuario autenticado.'},
@@ -245,11 +304,80 @@ def clientes(request):
     )
 
 
+def _bad_request(detail: str) -> Response:
+    return Response({'detail': detail}, status=status.HTTP_400_BAD_REQUEST)
+
+
+def _patch_cliente_name(request, cliente: Cliente, raw_value):
+    cliente_name = str(raw_value or '').strip()
+    if not cliente_name:
+        return _bad_request('Campo name e obrigatorio.')
+    cliente.name = cliente_name
+    return None
+
+
+def _patch_cliente_ad_account(request, cliente: Cliente, raw_value):
+    if raw_value in (None, ''):
+        return _bad_request('Campo nome e obrigatorio e deve conter o ID interno de AdAccount.')
+    try:
+        ad_account_id = int(raw_value)
+    except (TypeError, ValueError):
+        return _bad_request('Campo nome invalido. Informe o ID interno numerico de AdAccount.')
+
+    if not _ad_accounts_for_user(request.user).filter(id=ad_account_id).exists():
+        return Response(
+            {'detail': 'AdAccount nao encontrado para o usuario autenticado.'},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+    cliente.nome_id = ad_account_id
+    return None
+
+
+def _text_field_handler(field_name: str):
+    def handler(request, cliente: Cliente, raw_value):
+        setattr(cliente, field_name, str(raw_value or '').strip())
+        return None
+
+    return handler
+
+
+def _parsed_field_handler(field_name: str, parser):
+    def handler(request, cliente: Cliente, raw_value):
+        value, error = parser(raw_value)
+        if error is not None:
+            return _bad_request(error)
+        setattr(cliente, field_name, value)
+        return None
+
+    return handler
+
+
+def _decimal_field_handler(field_name: str):
+    return _parsed_field_handler(field_name, lambda raw_value: _parse_decimal_field(raw_value, field_name))
+
+
+# Applied in this order, so validation errors surface in the same order as the fields below.
+_CLIENTE_PATCH_HANDLERS = (
+    ('name', _patch_cliente_name),
+    ('nome', _patch_cliente_ad_account),
+    ('nicho_atuacao', _text_field_handler('nicho_atuacao')),
+    ('estado', _parsed_field_handler('estado', _parse_estado)),
+    ('descricao_estado', _text_field_handler('descricao_estado')),
+    ('forma_pagamento', _parsed_field_handler('forma_pagamento', _parse_forma_pagamento)),
+    ('periodo_cobranca', _parsed_field_handler('periodo_cobranca', _parse_periodo_cobranca)),
+    ('valor_investido', _decimal_field_handler('valor_investido')),
+    ('saldo_atual', _decimal_field_handler('saldo_atual')),
+    ('gasto_diario', _decimal_field_handler('gasto_diario')),
+)
+
+
 @api_view(['PATCH'])
 @permission_classes([IsAuthenticated])
+@renderer_classes([ORJSONRenderer, BrowsableAPIRenderer])
 def cliente_detail(request, cliente_id: int):
     cliente = (
         Cliente.objects.select_related('nome')
+        .only(*_CLIENTE_DETAIL_ONLY_FIELDS)
         .filter(id=cliente_id, nome__in=_ad_accounts_for_user(request.user))
         .first()
     )
@@ -259,108 +387,33 @@ def cliente_detail(request, cliente_id: int):
             status=status.HTTP_404_NOT_FOUND,
         )
 
-    has_updates = False
-
-    if 'name' in request.data:
-        cliente_name = str(request.data.get('name') or '').strip()
-        if not cliente_name:
-            return Response(
-                {'detail': 'Campo name e obrigatorio.'},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-        cliente.name = cliente_name
-        has_updates = True
-
-    if 'nome' in request.data:
-        ad_account_id_raw = request.data.get('nome')
-        if ad_account_id_raw in (None, ''):
-            return Response(
-                {'detail': 'Campo nome e obrigatorio e deve conter o ID interno de AdAccount.'},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-        try:
-            ad_account_id = int(ad_account_id_raw)
-        except (TypeError, ValueError):
-            return Response(
-                {'detail': 'Campo nome invalido. Informe o ID interno numerico de AdAccount.'},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        ad_account = _ad_accounts_for_user(request.user).filter(id=ad_account_id).first()
-        if ad_account is None:
-            return Response(
-                {'detail': 'AdAccount nao encontrado para o usuario autenticado.'},
-                status=status.HTTP_404_NOT_FOUND,
-            )
+    data = request.data
+    update_fields = []
+    for field_name, handler in _CLIENTE_PATCH_HANDLERS:
+        if field_name not in data:
+            continue
+        error_response = handler(request, cliente, data.get(field_name))
+        if error_response is not None:
+            return error_response
+        update_fields.append(field_name)
 
-        cliente.nome = ad_account
-        has_updates = True
-
-    if 'nicho_atuacao' in request.data:
-        cliente.nicho_atuacao = str(request.data.get('nicho_atuacao') or '').strip()
-        has_updates = True
-
-    if 'estado' in request.data:
-        estado, estado_error = _parse_estado(request.data.get('estado'))
-        if estado_error is not None:
-            return Response({'detail': estado_error}, status=status.HTTP_400_BAD_REQUEST)
-        cliente.estado = estado
-        has_updates = True
-
-    if 'descricao_estado' in request.data:
-        cliente.descricao_estado = str(request.data.get('descricao_estado') or '').strip()
-        has_updates = True
-
-    if 'forma_pagamento' in request.data:
-        forma_pagamento, forma_pagamento_error = _parse_forma_pagamento(request.data.get('forma_pagamento'))
-        if forma_pagamento_error is not None:
-            return Response({'detail': forma_pagamento_error}, status=status.HTTP_400_BAD_REQUEST)
-        cliente.forma_pagamento = forma_pagamento
-        has_updates = True
-
-    if 'periodo_cobranca' in request.data:
-        periodo_cobranca, periodo_cobranca_error = _parse_periodo_cobranca(request.data.get('periodo_cobranca'))
-        if periodo_cobranca_error is not None:
-            return Response({'detail': periodo_cobranca_error}, status=status.HTTP_400_BAD_REQUEST)
-        cliente.periodo_cobranca = periodo_cobranca
-        has_updates = True
-
-    if 'valor_investido' in request.data:
-        valor_investido, valor_investido_error = _parse_decimal_field(
-            request.data.get('valor_investido'),
-            'valor_investido',
-        )
-        if valor_investido_error is not None:
-            return Response({'detail': valor_investido_error}, status=status.HTTP_400_BAD_REQUEST)
-        cliente.valor_investido = valor_investido
-        has_updates = True
-
-    if 'saldo_atual' in request.data:
-        saldo_atual, saldo_atual_error = _parse_decimal_field(request.data.get('saldo_atual'), 'saldo_atual')
-        if saldo_atual_error is not None:
-            return Response({'detail': saldo_atual_error}, status=status.HTTP_400_BAD_REQUEST)
-        cliente.saldo_atual = saldo_atual
-        has_updates = True
-
-    if 'gasto_diario' in request.data:
-        gasto_diario, gasto_diario_error = _parse_decimal_field(request.data.get('gasto_diario'), 'gasto_diario')
-        if gasto_diario_error is not None:
-            return Response({'detail': gasto_diario_error}, status=status.HTTP_400_BAD_REQUEST)
-        cliente.gasto_diario = gasto_diario
-        has_updates = True
-
-    if not has_updates:
+    if not update_fields:
         return Response(
             {'detail': 'Nenhum campo valido enviado para atualizacao.'},
             status=status.HTTP_400_BAD_REQUEST,
         )
 
-    cliente.save()
-    cliente.refresh_from_db()
+    # auto_now fills updated_at on the instance, so the saved object can be serialized as is.
+    cliente.save(update_fields=[*update_fields, 'updated_at'])
+    if 'nome' in update_fields:
+        # Only nome_id was assigned; read the AdAccount columns together with the saved row.
+        payload = _serialize_cliente_row(Cliente.objects.values(*_CLIENTE_VALUE_FIELDS).get(pk=cliente.pk))
+    else:
+        payload = _serialize_cliente(cliente)
     return Response(
         {
             'detail': 'Cliente atualizado com sucesso.',
-            'cliente': _serialize_cliente(cliente),
+            'cliente': payload,
         },
         status=status.HTTP_200_OK,
     )
@@ -368,6 +421,7 @@ def cliente_detail(request, cliente_id: int):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@renderer_classes([ORJSONRenderer, BrowsableAPIRenderer])
 def empresa_ad_accounts(request):
     ad_accounts = (
         _ad_accounts_for_user(request.user)
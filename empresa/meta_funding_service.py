@@ -1,6 +1,19 @@
 import re
+from collections import defaultdict
+from datetime import date
 from decimal import Decimal, InvalidOperation
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import requests
+from django.db import transaction
+from django.db.models import Case, Value, When
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
+
+try:
+    import re2
+except ImportError:  # pragma: no cover - optional dependency during local checks
+    re2 = None
 
 from Dashboard.models import AdAccount, DashboardUser
 from Dashboard.services.meta_client import MetaClientError, MetaGraphClient
@@ -8,7 +21,15 @@ from Dashboard.services.meta_client import MetaClientError, MetaGraphClient
 from .models import Cliente
 
 
-DISPLAY_AMOUNT_RE = re.compile(r'R\$\s*([0-9][0-9\.,]*)', re.IGNORECASE)
+# Inline (?i) because google-re2 does not expose re-style flag constants.
+DISPLAY_AMOUNT_RE = (re2 or re).compile(r'(?i)R\$\s*([0-9][0-9\.,]*)')
+FUNDING_BATCH_MAX_WORKERS = 4
+FUNDING_UPDATE_BATCH_SIZE = 1000
+# Reused across syncs for keep-alive; MetaGraphClient already retries, so the adapter does not.
+_SHARED_SESSION = requests.Session()
+_SHARED_SESSION.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=20))
+_DELETE_DOT = str.maketrans('', '', '.')
+_DELETE_COMMA = str.maketrans('', '', ',')
 
 
 def _skip_result(detail: str) -> Dict:
@@ -36,15 +57,11 @@ def _parse_decimal_from_display_string(display_string: str) -> Optional[Decimal]
     if not number_text:
         return None
 
-    if ',' in number_text and '.' in number_text:
-        if number_text.rfind(',') > number_text.rfind('.'):
-            normalized = number_text.replace('.', '').replace(',', '.')
-        else:
-            normalized = number_text.replace(',', '')
-    elif ',' in number_text:
-        normalized = number_text.replace('.', '').replace(',', '.')
+    # A rightmost comma is the BRL decimal separator; otherwise commas group thousands.
+    if number_text.rfind(',') > number_text.rfind('.'):
+        normalized = number_text.translate(_DELETE_DOT).replace(',', '.')
     else:
-        normalized = number_text.replace(',', '')
+        normalized = number_text.translate(_DELETE_COMMA)
 
     try:
         return Decimal(normalized).quantize(Decimal('0.01'))
@@ -53,18 +70,35 @@ def _parse_decimal_from_display_string(display_string: str) -> Optional[Decimal]
 
 
 def _build_funding_calls(ad_account_ids: Iterable[str]) -> List[Dict[str, str]]:
-    calls: List[Dict[str, str]] = []
-    for ad_account_id in ad_account_ids:
-        clean_id = str(ad_account_id or '').strip()
-        if not clean_id:
-            continue
-        calls.append(
-            {
-                'method': 'GET',
-                'relative_url': f'{clean_id}?fields=funding_source_details',
-            }
-        )
-    return calls
+    clean_ids = [str(ad_account_id or '').strip() for ad_account_id in ad_account_ids]
+    return [
+        {
+            'method': 'GET',
+            'relative_url': f'{clean_id}?fields=funding_source_details',
+        }
+        for clean_id in clean_ids
+        if clean_id
+    ]
+
+
+def _apply_funding_updates(rows: List[Tuple[int, Decimal, date]]) -> None:
+    # One UPDATE per batch, with a CASE branch per distinct value rather than per row.
+    ids_by_saldo: Dict[Decimal, List[int]] = defaultdict(list)
+    ids_by_data_renovacao: Dict[date, List[int]] = defaultdict(list)
+    for cliente_id, saldo_atual, data_renovacao in rows:
+        ids_by_saldo[saldo_atual].append(cliente_id)
+        ids_by_data_renovacao[data_renovacao].append(cliente_id)
+
+    Cliente.objects.filter(pk__in=[row[0] for row in rows]).update(
+        saldo_atual=Case(
+            *(When(pk__in=ids, then=Value(amount)) for amount, ids in ids_by_saldo.items()),
+            output_field=Cliente._meta.get_field('saldo_atual'),
+        ),
+        data_renovacao_creditos=Case(
+            *(When(pk__in=ids, then=Value(value)) for value, ids in ids_by_data_renovacao.items()),
+            output_field=Cliente._meta.get_field('data_renovacao_creditos'),
+        ),
+    )
 
 
 def _resolve_meta_dashboard_user_and_token(user):
@@ -88,7 +122,19 @@ def sync_clientes_saldo_atual_from_meta(user, *, batch_size: int = 50) -> Dict:
         return skip_response
 
     accessible_ad_accounts = AdAccount.objects.accessible_to(dashboard_user)
-    clientes = list(Cliente.objects.select_related('nome').filter(nome__in=accessible_ad_accounts).order_by('-created_at'))
+    clientes = list(
+        # Only the joined columns the sync reads; grouping does not depend on row order.
+        Cliente.objects.filter(nome__in=accessible_ad_accounts)
+        .order_by()
+        .values_list(
+            'id',
+            'nome__id_meta_ad_account',
+            'saldo_atual',
+            'gasto_diario',
+            'data_renovacao_creditos',
+            named=True,
+        )
+    )
     if not clientes:
         return {
             'updated_clientes': 0,
@@ -100,14 +146,14 @@ def sync_clientes_saldo_atual_from_meta(user, *, batch_size: int = 50) -> Dict:
             'detail': 'Nenhum cliente para sincronizar.',
         }
 
-    ad_account_to_clientes: Dict[str, List[Cliente]] = {}
+    # One batch entry per Meta ad account; its parsed saldo is fanned out to every linked cliente.
+    ad_account_to_clientes: Dict[str, List] = defaultdict(list)
     for cliente in clientes:
-        ad_account_id = str(cliente.nome.id_meta_ad_account or '').strip()
-        if not ad_account_id:
-            continue
-        ad_account_to_clientes.setdefault(ad_account_id, []).append(cliente)
+        ad_account_id = (cliente.nome__id_meta_ad_account or '').strip()
+        if ad_account_id:
+            ad_account_to_clientes[ad_account_id].append(cliente)
 
-    ad_account_ids = list(ad_account_to_clientes.keys())
+    ad_account_ids = list(ad_account_to_clientes)
     calls = _build_funding_calls(ad_account_ids)
     if not calls:
         return {
@@ -124,6 +170,7 @@ def sync_clientes_saldo_atual_from_meta(user, *, batch_size: int = 50) -> Dict:
         access_token=access_token,
         request_pause_seconds=0,
         batch_size=max(1, int(batch_size or 1)),
+        session=_SHARED_SESSION,
     )
 
     try:
@@ -131,6 +178,7 @@ def sync_clientes_saldo_atual_from_meta(user, *, batch_size: int = 50) -> Dict:
             calls,
             entity='empresa_clientes_funding_source_details',
             batch_size=max(1, int(batch_size or 1)),
+            max_workers=FUNDING_BATCH_MAX_WORKERS,
         )
     except MetaClientError as exc:
         return {
@@ -171,28 +219,27 @@ def sync_clientes_saldo_atual_from_meta(user, *, batch_size: int = 50) -> Dict:
 
         parsed_amount_by_ad_account[ad_account_id] = parsed_amount
 
-    clientes_to_update: List[Cliente] = []
+    today = timezone.localdate()
+    pending_updates: List[Tuple[int, Decimal, date]] = []
     for ad_account_id, parsed_amount in parsed_amount_by_ad_account.items():
         linked_clientes = ad_account_to_clientes.get(ad_account_id) or []
         for cliente in linked_clientes:
-            has_updates = False
-            if cliente.saldo_atual != parsed_amount:
-                cliente.saldo_atual = parsed_amount
-                has_updates = True
-
-            next_data_renovacao = cliente.calcular_data_renovacao_creditos()
-            if cliente.data_renovacao_creditos != next_data_renovacao:
-                cliente.data_renovacao_creditos = next_data_renovacao
-                has_updates = True
+            next_data_renovacao = Cliente.calcular_data_renovacao(
+                parsed_amount,
+                cliente.gasto_diario,
+                base_date=today,
+            )
+            if cliente.saldo_atual == parsed_amount and cliente.data_renovacao_creditos == next_data_renovacao:
+                continue
 
-            if has_updates:
-                clientes_to_update.append(cliente)
+            pending_updates.append((cliente.id, parsed_amount, next_data_renovacao))
 
-    if clientes_to_update:
-        Cliente.objects.bulk_update(clientes_to_update, ['saldo_atual', 'data_renovacao_creditos'])
+    with transaction.atomic():
+        for start in range(0, len(pending_updates), FUNDING_UPDATE_BATCH_SIZE):
+            _apply_funding_updates(pending_updates[start:start + FUNDING_UPDATE_BATCH_SIZE])
 
     return {
-        'updated_clientes': len(clientes_to_update),
+        'updated_clientes': len(pending_updates),
         'total_clientes': len(clientes),
         'total_ad_accounts': len(ad_account_ids),
         'error_count': error_count,
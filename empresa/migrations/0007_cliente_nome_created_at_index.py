@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-16 02:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Dashboard', '0007_instagramaccount_total_interactions_and_more'),
+        ('empresa', '0006_cliente_descricao_estado_cliente_estado'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cliente',
+            index=models.Index(fields=['nome', '-created_at'], name='empresa_cli_nome_id_78eac6_idx'),
+        ),
+    ]
@@ -5,6 +5,11 @@ from django.db import models
 from django.utils import timezone
 
 
+_DEC_ZERO = Decimal(0)
+_DEC_TWO = Decimal(2)
+_RENOVACAO_INPUTS = frozenset({'saldo_atual', 'gasto_diario'})
+
+
 class Cliente(models.Model):
     ESTADO_MAU = 'MAU'
     ESTADO_REGULAR = 'REGULAR'
@@ -60,27 +65,40 @@ class Cliente(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['nome', '-created_at']),
+        ]
 
     def __str__(self):
         return f'{self.name} ({self.nome.name}) - renovacao {self.data_renovacao_creditos}'
 
-    def calcular_data_renovacao_creditos(self, *, base_date=None):
+    @staticmethod
+    def calcular_data_renovacao(saldo_atual, gasto_diario, *, base_date=None):
         today = base_date or timezone.localdate()
-        saldo = Decimal(self.saldo_atual or 0)
-        gasto = Decimal(self.gasto_diario or 0)
+        # DecimalField values are already Decimal; only defaults and raw input need converting.
+        saldo = saldo_atual if isinstance(saldo_atual, Decimal) else Decimal(saldo_atual or _DEC_ZERO)
+        gasto = gasto_diario if isinstance(gasto_diario, Decimal) else Decimal(gasto_diario or _DEC_ZERO)
 
-        if gasto <= 0:
+        if gasto <= _DEC_ZERO:
             dias = 0
         else:
-            dias = int((saldo / gasto) - Decimal('2'))
+            dias = int((saldo / gasto) - _DEC_TWO)
 
         return today + timedelta(days=dias)
 
+    def calcular_data_renovacao_creditos(self, *, base_date=None):
+        return self.calcular_data_renovacao(self.saldo_atual, self.gasto_diario, base_date=base_date)
+
     def save(self, *args, **kwargs):
-        self.data_renovacao_creditos = self.calcular_data_renovacao_creditos()
         update_fields = kwargs.get('update_fields')
+        if update_fields is not None and _RENOVACAO_INPUTS.isdisjoint(update_fields):
+            super().save(*args, **kwargs)
+            return
+
+        self.data_renovacao_creditos = self.calcular_data_renovacao_creditos()
         if update_fields is not None:
-            merged_update_fields = set(update_fields)
-            merged_update_fields.add('data_renovacao_creditos')
-            kwargs['update_fields'] = list(merged_update_fields)
+            update_fields = list(update_fields)
+            if 'data_renovacao_creditos' not in update_fields:
+                update_fields.append('data_renovacao_creditos')
+            kwargs['update_fields'] = update_fields
         super().save(*args, **kwargs)
@@ -0,0 +1,22 @@
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency during local checks
+    orjson = None
+
+from rest_framework.renderers import JSONRenderer
+
+
+class ORJSONRenderer(JSONRenderer):
+    # Dates and decimals still go through DRF's encoder so the wire format stays the same.
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return orjson.dumps(
+            data,
+            default=self.encoder_class().default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME,
+        )
+
+
+def render_json_bytes(data) -> bytes:
+    return ORJSONRenderer().render(data)
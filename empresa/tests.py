@@ -1,9 +1,13 @@
+import json
 from datetime import date, timedelta
 from decimal import Decimal
 from unittest.mock import patch
+from urllib.parse import urlencode
 
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from Dashboard.models import AdAccount, DashboardUser
@@ -47,6 +51,8 @@ class MetaFundingServiceTests(TestCase):
     def test_parse_display_string_brl_into_decimal(self):
         parsed = _parse_decimal_from_display_string('Saldo disponivel (R$193,47 BRL)')
         self.assertEqual(parsed, Decimal('193.47'))
+        self.assertEqual(_parse_decimal_from_display_string('R$ 1.234,56'), Decimal('1234.56'))
+        self.assertEqual(_parse_decimal_from_display_string('R$ 1,234.56'), Decimal('1234.56'))
 
     @patch('empresa.models.timezone.localdate', return_value=date(2026, 2, 20))
     def test_data_renovacao_creditos_is_calculated_from_saldo_and_gasto(self, _mocked_localdate):
@@ -65,6 +71,19 @@ class MetaFundingServiceTests(TestCase):
         # int(200/10 - 2) = 18; 2026-02-20 + 18 dias = 2026-03-10
         self.assertEqual(cliente.data_renovacao_creditos, date(2026, 3, 10))
 
+        _mocked_localdate.return_value = date(2026, 2, 25)
+        cliente.name = 'Cliente Formula Renomeado'
+        cliente.save(update_fields=['name'])
+        cliente.refresh_from_db()
+        self.assertEqual(cliente.data_renovacao_creditos, date(2026, 3, 10))
+
+        cliente.gasto_diario = Decimal('20.00')
+        cliente.save(update_fields=['gasto_diario'])
+        cliente.refresh_from_db()
+        # int(200/20 - 2) = 8; 2026-02-25 + 8 dias = 2026-03-05
+        self.assertEqual(cliente.data_renovacao_creditos, date(2026, 3, 5))
+
+    @patch('empresa.meta_funding_service.FUNDING_UPDATE_BATCH_SIZE', 1)
     @patch('empresa.meta_funding_service.MetaGraphClient.batch_request', autospec=True)
     @patch('empresa.models.timezone.localdate', return_value=date(2026, 2, 20))
     def test_sync_uses_single_batch_call_for_multiple_clientes_same_ad_account(
@@ -90,7 +109,9 @@ class MetaFundingServiceTests(TestCase):
             }
         ]
 
-        result = sync_clientes_saldo_atual_from_meta(self.user)
+        # DashboardUser, one joined cliente fetch, then SAVEPOINT + one UPDATE per batch + RELEASE.
+        with self.assertNumQueries(6):
+            result = sync_clientes_saldo_atual_from_meta(self.user)
 
         self.assertEqual(mocked_batch_request.call_count, 1)
         batch_calls = mocked_batch_request.call_args[0][1]
@@ -170,6 +191,17 @@ class ClientesEndpointRefreshSaldoTests(TestCase):
         self.assertIn('saldo_sync', payload)
         self.assertTrue(payload['saldo_sync']['skipped'])
 
+    @patch('empresa.api_views.sync_clientes_saldo_atual_from_meta')
+    def test_get_clientes_refresh_saldo_returns_finished_sync_result(self, mocked_sync):
+        mocked_sync.return_value = {'updated_clientes': 1, 'total_clientes': 1, 'skipped': False, 'detail': 'ok'}
+
+        response = self.client.get('/api/empresa/clientes', {'refresh_saldo': '1'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['saldo_sync'], mocked_sync.return_value)
+        mocked_sync.assert_called_once_with(self.user)
+        self.assertNotIn('saldo_sync', self.client.get('/api/empresa/clientes').json())
+
 
 class ClientesSharedAdAccountsAccessTests(TestCase):
     def setUp(self):
@@ -262,6 +294,57 @@ class ClientesEstadoEndpointTests(TestCase):
         self.assertEqual(payload['clientes'][0]['estado'], Cliente.ESTADO_REGULAR)
         self.assertEqual(payload['clientes'][0]['descricao_estado'], 'Acompanhamento inicial')
 
+    def test_get_clientes_keeps_drf_wire_format_for_decimals_and_dates(self):
+        response = self.client.get('/api/empresa/clientes')
+
+        self.assertEqual(response.status_code, 200)
+        cliente = response.json()['clientes'][0]
+        self.assertEqual(cliente['saldo_atual'], 120.0)
+        self.assertEqual(cliente['data_renovacao_creditos'], self.cliente.data_renovacao_creditos.isoformat())
+        self.assertTrue(cliente['created_at'].endswith('Z'))
+
+    def test_cliente_routes_accept_trailing_slash_without_redirect(self):
+        self.assertEqual(self.client.get('/api/empresa/clientes/').status_code, 200)
+        self.assertEqual(self.client.get('/api/empresa/ad-accounts/').status_code, 200)
+        response = self.client.patch(
+            f'/api/empresa/clientes/{self.cliente.id}/',
+            data={'descricao_estado': 'Com barra'},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_get_clientes_filters_by_ids_and_rejects_non_digit_ids(self):
+        response = self.client.get('/api/empresa/clientes', {'ids': f' {self.cliente.id} ,{self.cliente.id}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['total'], 1)
+
+        # The padded values skip the byte-set fast path and must still fail the ASCII digit check.
+        for raw_ids in ('+1', '1_0', '0', '1,-2', ' +1', '1_0 ,2', '\u0661'):
+            with self.subTest(raw_ids=raw_ids):
+                response = self.client.get('/api/empresa/clientes', {'ids': raw_ids})
+                self.assertEqual(response.status_code, 400)
+                response = self.client.delete(f"/api/empresa/clientes?{urlencode({'ids': raw_ids})}")
+                self.assertEqual(response.status_code, 400)
+        self.assertTrue(Cliente.objects.filter(pk=self.cliente.id).exists())
+
+    def test_get_clientes_below_threshold_runs_no_count_query(self):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get('/api/empresa/clientes')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.streaming)
+        self.assertFalse(any('COUNT(' in query['sql'].upper() for query in captured.captured_queries))
+
+    def test_get_clientes_streams_same_payload_above_threshold(self):
+        expected = self.client.get('/api/empresa/clientes').json()
+
+        with patch('empresa.api_views.CLIENTES_STREAM_THRESHOLD', 1):
+            response = self.client.get('/api/empresa/clientes')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(json.loads(b''.join(response.streaming_content)), expected)
+
     def test_patch_cliente_updates_estado_and_descricao(self):
         response = self.client.patch(
             f'/api/empresa/clientes/{self.cliente.id}',
@@ -277,6 +360,36 @@ class ClientesEstadoEndpointTests(TestCase):
         self.cliente.refresh_from_db()
         self.assertEqual(self.cliente.estado, Cliente.ESTADO_BOM)
         self.assertEqual(self.cliente.descricao_estado, 'Pagamento em dia')
+        self.assertEqual(
+            payload['cliente']['updated_at'],
+            self.cliente.updated_at.isoformat().replace('+00:00', 'Z'),
+        )
+        listed = self.client.get('/api/empresa/clientes', {'ids': self.cliente.id}).json()['clientes'][0]
+        self.assertEqual(payload['cliente'], listed)
+
+    def test_patch_cliente_switches_ad_account_and_recomputes_renovacao(self):
+        other_ad_account = AdAccount.objects.create(
+            id_meta_ad_account='act_900000000000001',
+            name='Conta API 2',
+            id_dashboard_user=self.dashboard_user,
+        )
+
+        response = self.client.patch(
+            f'/api/empresa/clientes/{self.cliente.id}',
+            data={'nome': other_ad_account.id, 'saldo_atual': '150,00'},
+            content_type='application/json',
+        )
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()['cliente']
+        self.assertEqual(payload['nome_id'], other_ad_account.id)
+        self.assertEqual(payload['nome'], 'Conta API 2')
+        self.assertEqual(payload['id_meta_ad_account'], 'act_900000000000001')
+
+        self.cliente.refresh_from_db()
+        self.assertEqual(self.cliente.nome_id, other_ad_account.id)
+        self.assertEqual(self.cliente.saldo_atual, Decimal('150.00'))
+        self.assertEqual(payload['data_renovacao_creditos'], self.cliente.data_renovacao_creditos.isoformat())
 
     def test_patch_cliente_rejects_invalid_estado(self):
         response = self.client.patch(
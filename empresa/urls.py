@@ -1,12 +1,10 @@
-from django.urls import path
+from django.urls import re_path
 
 from . import api_views
 
+# One pattern per route; the trailing slash is optional so both spellings resolve without a redirect.
 urlpatterns = [
-    path('clientes', api_views.clientes, name='empresa-clientes'),
-    path('clientes/', api_views.clientes, name='empresa-clientes-slash'),
-    path('clientes/<int:cliente_id>', api_views.cliente_detail, name='empresa-cliente-detail'),
-    path('clientes/<int:cliente_id>/', api_views.cliente_detail, name='empresa-cliente-detail-slash'),
-    path('ad-accounts', api_views.empresa_ad_accounts, name='empresa-ad-accounts'),
-    path('ad-accounts/', api_views.empresa_ad_accounts, name='empresa-ad-accounts-slash'),
+    re_path(r'^clientes/?$', api_views.clientes, name='empresa-clientes'),
+    re_path(r'^clientes/(?P<cliente_id>[0-9]+)/?$', api_views.cliente_detail, name='empresa-cliente-detail'),
+    re_path(r'^ad-accounts/?$', api_views.empresa_ad_accounts, name='empresa-ad-accounts'),
 ]
@@ -0,0 +1,32 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency during local checks
+    orjson = None
+
+
+# One keep-alive pool for every Graph API call made during the OAuth flow.
+# Only failed connections are retried: the OAuth code is single-use, so re-sending a request
+# Meta may already have processed (read error or 5xx) would hide its real error.
+graph_session = requests.Session()
+graph_session.mount(
+    'https://',
+    HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=50,
+        max_retries=Retry(total=2, connect=2, read=0, status=0, other=0, backoff_factor=0.2),
+    ),
+)
+
+
+def response_json(response):
+    # orjson.JSONDecodeError subclasses ValueError, so both parsers fall back the same way.
+    try:
+        if orjson is not None:
+            return orjson.loads(response.content)
+        return response.json()
+    except ValueError:
+        return {}
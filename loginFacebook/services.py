@@ -1,12 +1,76 @@
+import hashlib
+import threading
+import time
 from datetime import datetime, timedelta, timezone as dt_timezone
-from typing import Optional
+from functools import lru_cache
+from typing import NamedTuple, Optional
+from urllib.parse import urlencode
 
 import requests
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.utils import timezone
 
+from loginFacebook._http import graph_session, response_json
+
 
 PREVENTIVE_RENEWAL_DAYS = 50
+LONG_TOKEN_CACHE_SECONDS = 60
+LONG_TOKEN_CACHE_MAX_ENTRIES = 1024
+DEFAULT_FACEBOOK_LOGIN_SCOPE = (
+    'public_profile,email,business_management,ads_read,pages_read_engagement,instagram_basic'
+)
+_OAUTH_SETTING_NAMES = frozenset(
+    {'META_GRAPH_VERSION', 'META_APP_ID', 'META_APP_SECRET', 'FRONTEND_CONNECTION_URL', 'FACEBOOK_LOGIN_SCOPE'}
+)
+
+
+class MetaOAuthSettings(NamedTuple):
+    graph_version: str
+    app_id: str
+    app_secret: str
+    token_url: str
+    me_url: str
+    debug_token_url: str
+    dialog_url_prefix: str
+    frontend_connection_url: str
+    scope: str
+
+
+def _build_oauth_settings(graph_version: Optional[str] = None) -> MetaOAuthSettings:
+    graph_version = str(
+        graph_version or getattr(settings, 'META_GRAPH_VERSION', 'v24.0') or 'v24.0'
+    ).strip('/')
+    app_id = str(getattr(settings, 'META_APP_ID', '') or '').strip()
+    scope = str(getattr(settings, 'FACEBOOK_LOGIN_SCOPE', DEFAULT_FACEBOOK_LOGIN_SCOPE) or '').strip()
+    # Everything in the login dialog URL except redirect_uri and state is fixed per process.
+    dialog_params = {'client_id': app_id, 'response_type': 'code'}
+    if scope:
+        dialog_params['scope'] = scope
+    return MetaOAuthSettings(
+        graph_version=graph_version,
+        app_id=app_id,
+        app_secret=str(getattr(settings, 'META_APP_SECRET', '') or '').strip(),
+        token_url=f'https://graph.facebook.com/{graph_version}/oauth/access_token',
+        me_url=f'https://graph.facebook.com/{graph_version}/me',
+        debug_token_url=f'https://graph.facebook.com/{graph_version}/debug_token',
+        dialog_url_prefix=f'https://www.facebook.com/{graph_version}/dialog/oauth?{urlencode(dialog_params)}',
+        frontend_connection_url=str(getattr(settings, 'FRONTEND_CONNECTION_URL', '') or '').strip(),
+        scope=scope,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_oauth_settings() -> MetaOAuthSettings:
+    # Settings do not change at runtime; the cache is only reset by override_settings in tests.
+    return _build_oauth_settings()
+
+
+@receiver(setting_changed)
+def _reset_oauth_settings(*, setting, **kwargs) -> None:
+    if setting in _OAUTH_SETTING_NAMES:
+        get_oauth_settings.cache_clear()
 
 
 class MetaTokenExchangeError(Exception):
@@ -29,6 +93,9 @@ def _parse_positive_int(value) -> Optional[int]:
         return None
     if isinstance(value, bool):
         return None
+    if isinstance(value, int):
+        # Graph API JSON numbers arrive as int already.
+        return value if value > 0 else None
     try:
         parsed = int(float(str(value).strip()))
     except (TypeError, ValueError):
@@ -55,7 +122,7 @@ def _meta_expired_at_from_payload(payload) -> Optional[datetime]:
 
 def _meta_fetch_expired_at_with_debug_token(
     *,
-    graph_version: str,
+    debug_token_url: str,
     app_id: str,
     app_secret: str,
     input_token: str,
@@ -63,20 +130,16 @@ def _meta_fetch_expired_at_with_debug_token(
     if not app_id or not app_secret or not input_token:
         return None
 
-    url = f'https://graph.facebook.com/{graph_version}/debug_token'
     params = {
         'input_token': input_token,
         'access_token': f'{app_id}|{app_secret}',
     }
     try:
-        response = requests.get(url, params=params, timeout=30)
+        response = graph_session.get(debug_token_url, params=params, timeout=30)
     except requests.RequestException:
         return None
 
-    try:
-        payload = response.json()
-    except ValueError:
-        payload = {}
+    payload = response_json(response)
 
     if response.status_code >= 400:
         return None
@@ -96,6 +159,35 @@ def _meta_preventive_expired_at() -> datetime:
     return timezone.now() + timedelta(days=PREVENTIVE_RENEWAL_DAYS)
 
 
+# Long tokens stay in this process only; entries are (expires_at, result), evicted oldest first.
+_long_token_cache: dict[bytes, tuple[float, dict]] = {}
+_long_token_cache_lock = threading.Lock()
+
+
+def _long_token_cache_key(graph_version: str, app_id: str, short_token: str) -> bytes:
+    # Only a hash of the short token is kept, so the cache never holds it.
+    return hashlib.sha256(f'{graph_version}:{app_id}:{short_token}'.encode('utf-8')).digest()
+
+
+def _long_token_cache_get(key: bytes) -> Optional[dict]:
+    with _long_token_cache_lock:
+        entry = _long_token_cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del _long_token_cache[key]
+            return None
+        return dict(entry[1])
+
+
+def _long_token_cache_set(key: bytes, result: dict) -> None:
+    with _long_token_cache_lock:
+        _long_token_cache.pop(key, None)
+        while len(_long_token_cache) >= LONG_TOKEN_CACHE_MAX_ENTRIES:
+            del _long_token_cache[next(iter(_long_token_cache))]
+        _long_token_cache[key] = (time.monotonic() + LONG_TOKEN_CACHE_SECONDS, dict(result))
+
+
 def exchange_short_token_for_long_token(
     *,
     short_token: str,
@@ -107,11 +199,12 @@ def exchange_short_token_for_long_token(
     if not short_token:
         raise MetaTokenExchangeError('short_token obrigatorio para troca por long token.', 400)
 
-    graph_version = str(
-        graph_version or getattr(settings, 'META_GRAPH_VERSION', 'v24.0') or 'v24.0'
-    ).strip('/')
-    app_id = str(app_id or getattr(settings, 'META_APP_ID', '') or '').strip()
-    app_secret = str(app_secret or getattr(settings, 'META_APP_SECRET', '') or '').strip()
+    oauth_settings = get_oauth_settings()
+    if graph_version and str(graph_version).strip('/') != oauth_settings.graph_version:
+        oauth_settings = _build_oauth_settings(graph_version)
+    graph_version = oauth_settings.graph_version
+    app_id = str(app_id or oauth_settings.app_id).strip()
+    app_secret = str(app_secret or oauth_settings.app_secret).strip()
 
     if not app_id or not app_secret:
         raise MetaTokenExchangeError(
@@ -119,7 +212,12 @@ def exchange_short_token_for_long_token(
             500,
         )
 
-    url = f'https://graph.facebook.com/{graph_version}/oauth/access_token'
+    # A retried callback or double submit reuses the exchange made moments ago; failures are never cached.
+    cache_key = _long_token_cache_key(graph_version, app_id, short_token)
+    cached = _long_token_cache_get(cache_key)
+    if cached is not None:
+        return cached
+
     params = {
         'grant_type': 'fb_exchange_token',
         'client_id': app_id,
@@ -128,14 +226,11 @@ def exchange_short_token_for_long_token(
     }
 
     try:
-        response = requests.get(url, params=params, timeout=30)
+        response = graph_session.get(oauth_settings.token_url, params=params, timeout=30)
     except requests.RequestException as exc:
         raise MetaTokenExchangeError(f'Falha de rede ao trocar token: {exc}', 502) from exc
 
-    try:
-        payload = response.json()
-    except ValueError:
-        payload = {}
+    payload = response_json(response)
 
     if response.status_code >= 400:
         raise MetaTokenExchangeError(
@@ -154,7 +249,7 @@ def exchange_short_token_for_long_token(
     expiration_source = 'exchange'
     if expired_at is None:
         expired_at = _meta_fetch_expired_at_with_debug_token(
-            graph_version=graph_version,
+            debug_token_url=oauth_settings.debug_token_url,
             app_id=app_id,
             app_secret=app_secret,
             input_token=long_token,
@@ -164,9 +259,11 @@ def exchange_short_token_for_long_token(
         expired_at = _meta_preventive_expired_at()
         expiration_source = f'preventive_{PREVENTIVE_RENEWAL_DAYS}d'
 
-    return {
+    result = {
         'long_token': long_token,
         'expired_at': expired_at,
         'expiration_source': expiration_source,
         'graph_version': graph_version,
     }
+    _long_token_cache_set(cache_key, result)
+    return result
@@ -1,3 +1,282 @@
-from django.test import TestCase
+import gzip
+import json
+import time
+from unittest.mock import Mock, patch
+from urllib.parse import parse_qs, urlsplit
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from Dashboard.models import DashboardUser
+from loginFacebook._http import graph_session
+from loginFacebook import services
+from loginFacebook.services import exchange_short_token_for_long_token
+
+
+User = get_user_model()
+
+
+def _graph_response(payload, status_code=200):
+    return Mock(status_code=status_code, content=json.dumps(payload).encode())
+
+
+def _fake_graph_get(url, params=None, timeout=None):
+    if url.endswith('/oauth/access_token') and params.get('code'):
+        return _graph_response({'access_token': 'short-token'})
+    if url.endswith('/me'):
+        return _graph_response({'id': 'meta-user-1', 'name': 'Meta User'})
+    if url.endswith('/oauth/access_token'):
+        return _graph_response({'access_token': 'long-token', 'expires_in': 3600})
+    raise AssertionError(f'Unexpected Graph call: {url}')
+
+
+@override_settings(
+    META_APP_ID='app-id',
+    META_APP_SECRET='app-secret',
+    FRONTEND_CONNECTION_URL='https://front.example/conexoes?tab=meta',
+    CORS_ALLOWED_ORIGINS=['https://app.example'],
+    CORS_ALLOWED_ORIGIN_REGEXES=[r'^https://.*\.preview\.example$'],
+)
+class FacebookLoginCallbackTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='oauth-user', password='Secret123!')
+        self.client.force_login(self.user)
+        self.addCleanup(services._long_token_cache.clear)
+
+    def _start(self, **params):
+        response = self.client.get('/api/facebook-auth/start', params)
+        self.assertEqual(response.status_code, 302)
+        return parse_qs(urlsplit(response['Location']).query)['state'][0]
+
+    def test_start_requires_get_and_authenticated_user(self):
+        self.assertEqual(self.client.post('/api/facebook-auth/start').status_code, 405)
+
+        self.client.logout()
+        response = self.client.get('/api/facebook-auth/start', {'popup': '1'})
+        self.assertEqual(response.status_code, 302)
+        self.assertIn('?next=/api/facebook-auth/start%3Fpopup%3D1', response['Location'])
+
+    def test_start_follows_overridden_graph_settings(self):
+        with override_settings(META_GRAPH_VERSION='v99.0', META_APP_ID='other-app'):
+            response = self.client.get('/api/facebook-auth/start')
+
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(
+            response['Location'].startswith('https://www.facebook.com/v99.0/dialog/oauth?client_id=other-app&')
+        )
+        query = parse_qs(urlsplit(response['Location']).query)
+        self.assertEqual(query['redirect_uri'], ['http://testserver/api/facebook-auth/callback'])
+        self.assertEqual(query['response_type'], ['code'])
+        self.assertIn('ads_read', query['scope'][0])
+
+    @patch('loginFacebook._http.graph_session.get', side_effect=_fake_graph_get)
+    def test_callback_links_meta_user_and_redirects_to_frontend(self, mocked_get):
+        state = self._start()
+
+        response = self.client.get('/api/facebook-auth/callback', {'state': state, 'code': 'oauth-code'})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response['Location'], 'https://front.example/conexoes?tab=meta&fb_connected=1')
+        dashboard_user = DashboardUser.objects.get(user=self.user)
+        self.assertEqual(dashboard_user.id_meta_user, 'meta-user-1')
+        self.assertEqual(dashboard_user.long_access_token, 'long-token')
+        self.assertIsNotNone(dashboard_user.expired_at)
+        self.assertEqual(mocked_get.call_count, 3)
+
+    @patch('loginFacebook._http.graph_session.get', side_effect=_fake_graph_get)
+    def test_callback_rejects_invalid_state(self, mocked_get):
+        self._start()
+
+        response = self.client.get('/api/facebook-auth/callback', {'state': 'forged', 'code': 'oauth-code'})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertIn('fb_error=State+OAuth+invalido+ou+expirado.', response['Location'])
+        mocked_get.assert_not_called()
+        self.assertFalse(DashboardUser.objects.filter(user=self.user).exists())
+
+    @patch('loginFacebook._http.graph_session.get', side_effect=_fake_graph_get)
+    def test_callback_popup_posts_result_to_next_origin_without_session_state(self, mocked_get):
+        state = self._start(next='https://app.example/integracoes?x=1', popup='1')
+        self.assertNotIn('facebook_oauth_state', self.client.session)
+
+        response = self.client.get('/api/facebook-auth/callback', {'state': state, 'code': 'oauth-code'})
+
+        self.assertEqual(response.status_code, 200)
+        html = response.content.decode()
+        self.assertIn('var targetOrigin = "https://app.example";', html)
+        self.assertIn('"status": "success"', html)
+        self.assertIn('https://app.example/integracoes?x=1&amp;fb_connected=1', html)
+
+    @patch('loginFacebook._http.graph_session.get', side_effect=_fake_graph_get)
+    def test_callback_popup_escapes_next_path_in_fallback_link(self, mocked_get):
+        state = self._start(next="https://app.example/x'><img src=x onerror=alert(document.cookie)>", popup='1')
+
+        response = self.client.get('/api/facebook-auth/callback', {'state': state, 'code': 'oauth-code'})
+
+        html = response.content.decode()
+        self.assertNotIn('<img', html)
+        self.assertIn("href='https://app.example/x&#x27;&gt;&lt;img src=x", html)
+
+    def test_callback_popup_escapes_error_inside_script(self):
+        state = self._start(next='https://app.example/integracoes', popup='1')
+
+        response = self.client.get(
+            '/api/facebook-auth/callback',
+            {'state': state, 'error_description': 'Negado "x" </script><script>alert(1)'},
+        )
+
+        html = response.content.decode()
+        self.assertNotIn('</script><script>', html)
+        self.assertIn('"error": "Negado \\"x\\" \\u003c/script>\\u003cscript>alert(1)"}', html)
+
+    @patch('loginFacebook._http.graph_session.get', side_effect=_fake_graph_get)
+    def test_callback_ignores_next_outside_allowed_origins(self, mocked_get):
+        allowed_state = self._start(next='https://pr-7.preview.example/conexoes')
+        evil_state = self._start(next='https://evil.example/phish')
+
+        allowed = self.client.get('/api/facebook-auth/callback', {'state': allowed_state, 'code': 'oauth-code'})
+        evil = self.client.get('/api/facebook-auth/callback', {'state': evil_state, 'code': 'oauth-code'})
+
+        self.assertEqual(allowed['Location'], 'https://pr-7.preview.example/conexoes?fb_connected=1')
+        self.assertEqual(evil['Location'], 'https://front.example/conexoes?tab=meta&fb_connected=1')
+
+    @patch('loginFacebook._http.graph_session.get', side_effect=_fake_graph_get)
+    def test_callback_ignores_next_that_only_looks_allowed_to_the_wildcard_regex(self, mocked_get):
+        for next_url in (
+            'https://evil.com\\x.preview.example/p',
+            'https://evil.com@x.preview.example/p',
+            'https://evil.com\tx.preview.example/p',
+        ):
+            with self.subTest(next_url=next_url):
+                state = self._start(next=next_url)
+
+                response = self.client.get('/api/facebook-auth/callback', {'state': state, 'code': 'oauth-code'})
+
+                self.assertEqual(response['Location'], 'https://front.example/conexoes?tab=meta&fb_connected=1')
+
+    @patch('loginFacebook._http.graph_session.get', side_effect=_fake_graph_get)
+    def test_callback_rejects_replayed_state(self, mocked_get):
+        state = self._start()
+        first = self.client.get('/api/facebook-auth/callback', {'state': state, 'code': 'oauth-code'})
+        self.assertEqual(first['Location'], 'https://front.example/conexoes?tab=meta&fb_connected=1')
+
+        replay = self.client.get('/api/facebook-auth/callback', {'state': state, 'code': 'other-code'})
+
+        self.assertIn('fb_error=State+OAuth+invalido+ou+expirado.', replay['Location'])
+        self.assertEqual(mocked_get.call_count, 3)
+
+    @patch('loginFacebook._http.graph_session.get', side_effect=_fake_graph_get)
+    def test_callback_rejects_state_issued_to_another_user(self, mocked_get):
+        state = self._start()
+        other_user = User.objects.create_user(username='other-oauth-user', password='Secret123!')
+        self.client.force_login(other_user)
+
+        response = self.client.get('/api/facebook-auth/callback', {'state': state, 'code': 'oauth-code'})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertIn('fb_error=State+OAuth+invalido+ou+expirado.', response['Location'])
+        mocked_get.assert_not_called()
+
+    @patch('loginFacebook._http.graph_session.get', side_effect=_fake_graph_get)
+    def test_callback_refuses_meta_user_linked_to_another_user(self, mocked_get):
+        other_user = User.objects.create_user(username='linked-user', password='Secret123!')
+        DashboardUser.objects.create(user=other_user, id_meta_user='meta-user-1', long_access_token='old-token')
+        state = self._start()
+
+        response = self.client.get('/api/facebook-auth/callback', {'state': state, 'code': 'oauth-code'})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertIn('fb_error=id_meta_user+ja+conectado', response['Location'])
+        self.assertFalse(DashboardUser.objects.filter(user=self.user).exists())
+        self.assertEqual(DashboardUser.objects.get(user=other_user).long_access_token, 'old-token')
+
+    @patch('loginFacebook._http.graph_session.get', side_effect=_fake_graph_get)
+    def test_callback_keeps_existing_link_when_meta_user_belongs_to_another_user(self, mocked_get):
+        other_user = User.objects.create_user(username='linked-user', password='Secret123!')
+        DashboardUser.objects.create(user=other_user, id_meta_user='meta-user-1', long_access_token='other-token')
+        DashboardUser.objects.create(user=self.user, id_meta_user='meta-user-2', long_access_token='old-token')
+        state = self._start()
+
+        response = self.client.get('/api/facebook-auth/callback', {'state': state, 'code': 'oauth-code'})
+
+        self.assertIn('fb_error=id_meta_user+ja+conectado', response['Location'])
+        dashboard_user = DashboardUser.objects.get(user=self.user)
+        self.assertEqual(dashboard_user.id_meta_user, 'meta-user-2')
+        self.assertEqual(dashboard_user.long_access_token, 'old-token')
+
+    @patch('loginFacebook._http.graph_session.get', side_effect=_fake_graph_get)
+    def test_callback_refreshes_existing_dashboard_user_token(self, mocked_get):
+        DashboardUser.objects.create(user=self.user, id_meta_user='meta-user-1', long_access_token='old-token')
+        state = self._start()
+
+        response = self.client.get('/api/facebook-auth/callback', {'state': state, 'code': 'oauth-code'})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(DashboardUser.objects.get(user=self.user).long_access_token, 'long-token')
+
+    def test_graph_session_only_retries_failed_connections(self):
+        retry = graph_session.get_adapter('https://graph.facebook.com/').max_retries
+
+        self.assertEqual(retry.connect, 2)
+        self.assertEqual(retry.read, 0)
+        self.assertEqual(retry.status, 0)
+        self.assertFalse(retry.status_forcelist)
+
+    @patch('loginFacebook._http.graph_session.get')
+    def test_callback_reports_me_error_before_exchange_result(self, mocked_get):
+        def fake_get(url, params=None, timeout=None):
+            if url.endswith('/me'):
+                return _graph_response({'error': {'message': 'Token sem permissao.'}}, status_code=400)
+            return _fake_graph_get(url, params=params, timeout=timeout)
+
+        mocked_get.side_effect = fake_get
+        state = self._start()
+
+        response = self.client.get('/api/facebook-auth/callback', {'state': state, 'code': 'oauth-code'})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertIn('fb_error=Token+sem+permissao.', response['Location'])
+        self.assertFalse(DashboardUser.objects.filter(user=self.user).exists())
+
+    @patch('loginFacebook._http.graph_session.get', side_effect=_fake_graph_get)
+    def test_long_token_exchange_is_reused_for_repeated_short_token(self, mocked_get):
+        first = exchange_short_token_for_long_token(short_token='short-token')
+        second = exchange_short_token_for_long_token(short_token='short-token')
+
+        self.assertEqual(first, second)
+        self.assertEqual(second['long_token'], 'long-token')
+        self.assertEqual(mocked_get.call_count, 1)
+
+    @patch('loginFacebook.services.LONG_TOKEN_CACHE_MAX_ENTRIES', 1)
+    @patch('loginFacebook._http.graph_session.get', side_effect=_fake_graph_get)
+    def test_long_token_cache_is_bounded_and_expires(self, mocked_get):
+        exchange_short_token_for_long_token(short_token='short-a')
+        exchange_short_token_for_long_token(short_token='short-b')
+        exchange_short_token_for_long_token(short_token='short-a')
+        self.assertEqual(mocked_get.call_count, 3)
+        self.assertEqual(len(services._long_token_cache), 1)
+
+        with patch('loginFacebook.services.time.monotonic', return_value=time.monotonic() + 61):
+            exchange_short_token_for_long_token(short_token='short-a')
+        self.assertEqual(mocked_get.call_count, 4)
+
+
+class LegalPagesTests(TestCase):
+    def test_privacy_policy_is_gzipped_and_revalidated_by_etag(self):
+        response = self.client.get('/privacy-policy', HTTP_ACCEPT_ENCODING='gzip, deflate')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertIn('Politica de Privacidade', gzip.decompress(response.content).decode())
+
+        not_modified = self.client.get('/privacy-policy', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b'')
+
+    def test_data_deletion_is_plain_without_gzip_support(self):
+        response = self.client.get('/data-deletion')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertIn('Exclusao de Dados do Usuario', response.content.decode())
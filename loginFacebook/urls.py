@@ -1,10 +1,9 @@
-from django.urls import path
+from django.urls import re_path
 
 from . import views
 
+# One pattern per route; the trailing slash is optional so both spellings resolve without a redirect.
 urlpatterns = [
-    path('start', views.facebook_login_start, name='facebook-login-start'),
-    path('start/', views.facebook_login_start, name='facebook-login-start-slash'),
-    path('callback', views.facebook_login_callback, name='facebook-login-callback'),
-    path('callback/', views.facebook_login_callback, name='facebook-login-callback-slash'),
+    re_path(r'^start/?$', views.facebook_login_start, name='facebook-login-start'),
+    re_path(r'^callback/?$', views.facebook_login_callback, name='facebook-login-callback'),
 ]
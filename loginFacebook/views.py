@@ -1,17 +1,83 @@
+import gzip
+import hashlib
+import re
 import secrets
-import json
-from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import NamedTuple
+from urllib.parse import parse_qsl, quote, urlencode, urlsplit, urlunsplit
 
 import requests
 from django.conf import settings
-from django.contrib.auth.decorators import login_required
-from django.db import transaction
-from django.http import HttpResponse, HttpResponseRedirect, JsonResponse
+from django.contrib.auth.views import redirect_to_login
+from django.core import signing
+from django.core.cache import cache
+from django.core.signals import setting_changed
+from django.db import IntegrityError, transaction
+from django.dispatch import receiver
+from django.http import HttpResponse, HttpResponseNotAllowed, HttpResponseRedirect, JsonResponse
 from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.html import format_html
 from django.views.decorators.http import require_GET
 
 from Dashboard.models import DashboardUser
-from loginFacebook.services import MetaTokenExchangeError, exchange_short_token_for_long_token
+from loginFacebook._http import graph_session, response_json
+from loginFacebook.services import (
+    MetaTokenExchangeError,
+    exchange_short_token_for_long_token,
+    get_oauth_settings,
+)
+
+
+OAUTH_STATE_SALT = 'loginFacebook.oauth-state'
+OAUTH_STATE_MAX_AGE_SECONDS = 600
+_ALLOWED_ORIGIN_SETTING_NAMES = frozenset(
+    {'CORS_ALLOWED_ORIGINS', 'CORS_ALLOWED_ORIGIN_REGEXES', 'FRONTEND_CONNECTION_URL'}
+)
+STATIC_PAGE_MAX_AGE_SECONDS = 86400
+
+
+# Only the payload, target origin and fallback link vary between popup responses.
+_POPUP_HTML_TEMPLATE = """<!doctype html>
+<html lang="pt-BR">
+  <head>
+    <meta charset="utf-8" />
+    <title>Facebook Login</title>
+  </head>
+  <body>
+    <script>
+      (function () {{
+        var payload = {payload_json};
+        var targetOrigin = {target_origin_json};
+        if (window.opener && !window.opener.closed) {{
+          try {{
+            window.opener.postMessage(payload, targetOrigin || "*");
+          }} catch (err) {{}}
+        }}
+        window.close();
+      }})();
+    </script>
+    <p>Finalizando login do Facebook...</p>
+    {fallback_html}
+  </body>
+</html>"""
+
+
+# The popup payload has fixed keys, so only its two strings need JSON escaping.
+# "<" is escaped too so an error message can never close the inline <script>.
+_JSON_STRING_ESCAPES = {
+    **{code: f'\\u{code:04x}' for code in range(0x20)},
+    ord('"'): '\\"',
+    ord('\\'): '\\\\',
+    ord('<'): '\\u003c',
+    0x2028: '\\u2028',
+    0x2029: '\\u2029',
+}
+
+
+def _json_string(value: str) -> str:
+    return f'"{value.translate(_JSON_STRING_ESCAPES)}"'
 
 
 def _meta_error_message(payload, fallback: str) -> str:
@@ -22,90 +88,196 @@ def _meta_error_message(payload, fallback: str) -> str:
     return fallback
 
 
+@lru_cache(maxsize=32)
+def _callback_uri_for_host(scheme_host: str) -> str:
+    # get_host() already validated the host against ALLOWED_HOSTS, so the cache stays small.
+    return f"{scheme_host}{reverse('facebook-login-callback')}"
+
+
+@receiver(setting_changed)
+def _reset_callback_uri(*, setting, **kwargs) -> None:
+    if setting == 'ROOT_URLCONF':
+        _callback_uri_for_host.cache_clear()
+
+
+def _callback_uri(request) -> str:
+    return _callback_uri_for_host(f'{request.scheme}://{request.get_host()}')
+
+
+def _fetch_meta_user_id(*, me_url: str, short_token: str):
+    me_params = {
+        'fields': 'id,name',
+        'access_token': short_token,
+    }
+    try:
+        me_response = graph_session.get(me_url, params=me_params, timeout=30)
+    except requests.RequestException as exc:
+        return None, f'Falha de rede ao consultar /me no Facebook: {exc}'
+
+    me_payload = response_json(me_response)
+
+    if me_response.status_code >= 400:
+        return None, _meta_error_message(me_payload, 'Falha ao obter dados do usuario em /me.')
+
+    id_meta_user = str(me_payload.get('id') or '').strip()
+    if not id_meta_user:
+        return None, 'Facebook /me nao retornou id do usuario.'
+    return id_meta_user, None
+
+
 def _is_absolute_http_url(value: str) -> bool:
     return value.startswith('http://') or value.startswith('https://')
 
 
+_UNSAFE_NETLOC_RE = re.compile(r'[\\@\s\x00-\x1f\x7f]')
+
+
 def _origin_from_url(value: str) -> str:
-    parsed = urlsplit(value)
-    if parsed.scheme in {'http', 'https'} and parsed.netloc:
-        return f'{parsed.scheme}://{parsed.netloc}'
-    return ''
+    scheme, sep, rest = value.partition('://')
+    scheme = scheme.lower()
+    if not sep or scheme not in {'http', 'https'}:
+        return ''
+    # The netloc ends at the first path, query or fragment delimiter, as in urlsplit.
+    end = len(rest)
+    for delimiter in '/?#':
+        index = rest.find(delimiter, 0, end)
+        if index != -1:
+            end = index
+    netloc = rest[:end]
+    # Browsers read a backslash as "/" and drop whitespace, and "@" moves the host past userinfo,
+    # so a netloc with any of them is not the host the browser would actually navigate to.
+    if not netloc or _UNSAFE_NETLOC_RE.search(netloc):
+        return ''
+    return f'{scheme}://{netloc}'
+
+
+@lru_cache(maxsize=1)
+def _allowed_origin_re():
+    # OAuth results only go back to known frontends: the CORS allowlist plus FRONTEND_CONNECTION_URL.
+    origins = [str(origin).rstrip('/') for origin in getattr(settings, 'CORS_ALLOWED_ORIGINS', ()) or ()]
+    frontend_origin = _origin_from_url(get_oauth_settings().frontend_connection_url)
+    if frontend_origin:
+        origins.append(frontend_origin)
+    patterns = [re.escape(origin) for origin in origins if origin]
+    patterns.extend(getattr(settings, 'CORS_ALLOWED_ORIGIN_REGEXES', ()) or ())
+    if not patterns:
+        return None
+    return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns), re.IGNORECASE)
+
+
+@receiver(setting_changed)
+def _reset_allowed_origin_re(*, setting, **kwargs) -> None:
+    if setting in _ALLOWED_ORIGIN_SETTING_NAMES:
+        _allowed_origin_re.cache_clear()
+
+
+def _allowed_origin(url: str) -> str:
+    origin = _origin_from_url(url)
+    allowed_re = _allowed_origin_re()
+    if not origin or allowed_re is None or not allowed_re.fullmatch(origin):
+        return ''
+    return origin
+
+
+@lru_cache(maxsize=256)
+def _split_url_with_query(url: str):
+    # Redirect bases repeat (FRONTEND_CONNECTION_URL and a few next URLs), so parse each one once.
+    parsed = urlsplit(url)
+    return parsed, tuple(parse_qsl(parsed.query, keep_blank_values=True))
 
 
 def _merge_query_params(url: str, new_params: dict[str, str]) -> str:
-    parsed = urlsplit(url)
-    current = dict(parse_qsl(parsed.query, keep_blank_values=True))
-    current.update({k: v for k, v in new_params.items() if v is not None})
+    params = {k: v for k, v in new_params.items() if v is not None}
+    base, hash_sign, fragment = url.partition('#')
+    if '?' not in base:
+        # Nothing to merge with, so append instead of parsing and rebuilding the URL.
+        query = f'?{urlencode(params)}' if params else ''
+        return f'{base}{query}{hash_sign}{fragment}'
+
+    parsed, query_pairs = _split_url_with_query(url)
+    current = dict(query_pairs)
+    current.update(params)
     merged_query = urlencode(current)
     return urlunsplit((parsed.scheme, parsed.netloc, parsed.path, merged_query, parsed.fragment))
 
 
-def _resolve_frontend_redirect_base(request) -> str:
-    candidate = str(request.session.pop('facebook_oauth_next', '') or '').strip()
+def _reject_oauth_request(request):
+    # Same responses as require_GET + login_required, without the two wrapper frames.
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+    if not request.user.is_authenticated:
+        return redirect_to_login(request.get_full_path())
+    return None
+
+
+def _load_oauth_state(request):
+    # The signed state carries the flow options, so start/callback need no session writes.
+    received_state = str(request.GET.get('state') or '').strip()
+    if not received_state:
+        return None
+    try:
+        payload = signing.loads(received_state, salt=OAUTH_STATE_SALT, max_age=OAUTH_STATE_MAX_AGE_SECONDS)
+    except signing.BadSignature:
+        return None
+    if not isinstance(payload, dict) or payload.get('u') != request.user.pk:
+        return None
+    # The signature alone would let a state be replayed until it expires, so each nonce is used once.
+    nonce = payload.get('n')
+    if not isinstance(nonce, str) or not cache.add(f'fb-oauth-state:{nonce}', 1, OAUTH_STATE_MAX_AGE_SECONDS):
+        return None
+    return payload
+
+
+def _resolve_frontend_redirect_base(request, next_url: str) -> str:
+    candidate = str(next_url or '').strip()
     if _is_absolute_http_url(candidate):
         return candidate
 
-    candidate = str(getattr(settings, 'FRONTEND_CONNECTION_URL', '') or '').strip()
+    candidate = get_oauth_settings().frontend_connection_url
     if _is_absolute_http_url(candidate):
         return candidate
 
     candidate = str(request.headers.get('Referer') or '').strip()
-    if _is_absolute_http_url(candidate):
+    if _allowed_origin(candidate):
         return candidate
 
     return ''
 
 
-def _redirect_with_oauth_result(request, *, connected: bool, error_message: str = ''):
-    popup_mode = bool(request.session.pop('facebook_oauth_popup', False))
-    popup_target_origin = str(request.session.pop('facebook_oauth_target_origin', '') or '').strip()
+def _redirect_with_oauth_result(request, oauth_state: dict, *, connected: bool, error_message: str = ''):
+    popup_mode = bool(oauth_state.get('popup'))
+    next_url = str(oauth_state.get('next') or '')
+    popup_target_origin = _origin_from_url(next_url)
+    # Both the popup fallback link and the redirect carry the same result query.
+    result_params = {'fb_connected': '1'} if connected else {'fb_error': error_message or 'oauth_failed'}
     if popup_mode:
         if not _is_absolute_http_url(popup_target_origin):
-            popup_target_origin = _origin_from_url(str(getattr(settings, 'FRONTEND_CONNECTION_URL', '') or '').strip())
+            popup_target_origin = _origin_from_url(get_oauth_settings().frontend_connection_url)
 
-        payload = {
-            'type': 'facebook_oauth_result',
-            'status': 'success' if connected else 'error',
-            'error': (error_message or None) if not connected else None,
-        }
+        error_json = _json_string(error_message) if not connected and error_message else 'null'
+        payload_json = (
+            f'{{"type": "facebook_oauth_result", "status": "{"success" if connected else "error"}", '
+            f'"error": {error_json}}}'
+        )
 
         # Fallback content in case browser blocks window.close.
-        fallback_base = _resolve_frontend_redirect_base(request)
-        if fallback_base:
-            if connected:
-                fallback_url = _merge_query_params(fallback_base, {'fb_connected': '1'})
-            else:
-                fallback_url = _merge_query_params(fallback_base, {'fb_error': error_message or 'oauth_failed'})
-        else:
-            fallback_url = ''
-
-        html = f"""<!doctype html>
-<html lang="pt-BR">
-  <head>
-    <meta charset="utf-8" />
-    <title>Facebook Login</title>
-  </head>
-  <body>
-    <script>
-      (function () {{
-        var payload = {json.dumps(payload, ensure_ascii=False)};
-        var targetOrigin = {json.dumps(popup_target_origin, ensure_ascii=False)};
-        if (window.opener && !window.opener.closed) {{
-          try {{
-            window.opener.postMessage(payload, targetOrigin || "*");
-          }} catch (err) {{}}
-        }}
-        window.close();
-      }})();
-    </script>
-    <p>Finalizando login do Facebook...</p>
-    {"<p><a href='" + fallback_url + "'>Voltar para a aplicacao</a></p>" if fallback_url else ""}
-  </body>
-</html>"""
+        fallback_base = _resolve_frontend_redirect_base(request, next_url)
+        fallback_url = _merge_query_params(fallback_base, result_params) if fallback_base else ''
+
+        # next is only origin-checked, so its path and query must be escaped into the attribute.
+        fallback_html = (
+            format_html("<p><a href='{}'>Voltar para a aplicacao</a></p>", fallback_url) if fallback_url else ''
+        )
+        html = _POPUP_HTML_TEMPLATE.format_map(
+            {
+                'payload_json': payload_json,
+                'target_origin_json': _json_string(popup_target_origin),
+                'fallback_html': fallback_html,
+            }
+        )
         return HttpResponse(html)
 
-    base_url = _resolve_frontend_redirect_base(request)
+    base_url = _resolve_frontend_redirect_base(request, next_url)
     if not base_url:
         fallback = (
             'FRONTEND_CONNECTION_URL nao configurado para redirecionamento OAuth.'
@@ -114,71 +286,46 @@ def _redirect_with_oauth_result(request, *, connected: bool, error_message: str
         )
         return JsonResponse({'detail': fallback}, status=400)
 
-    if connected:
-        redirect_url = _merge_query_params(base_url, {'fb_connected': '1'})
-    else:
-        redirect_url = _merge_query_params(base_url, {'fb_error': error_message or 'oauth_failed'})
-    return HttpResponseRedirect(redirect_url)
+    return HttpResponseRedirect(_merge_query_params(base_url, result_params))
 
 
-@require_GET
-@login_required
 def facebook_login_start(request):
-    app_id = str(getattr(settings, 'META_APP_ID', '') or '').strip()
-    if not app_id:
+    rejected = _reject_oauth_request(request)
+    if rejected is not None:
+        return rejected
+
+    oauth_settings = get_oauth_settings()
+    if not oauth_settings.app_id:
         return JsonResponse(
             {'detail': 'META_APP_ID nao configurado no backend.'},
             status=500,
         )
 
-    graph_version = str(getattr(settings, 'META_GRAPH_VERSION', 'v24.0') or 'v24.0').strip('/')
-    redirect_uri = request.build_absolute_uri(reverse('facebook-login-callback'))
-    scope = str(
-        getattr(
-            settings,
-            'FACEBOOK_LOGIN_SCOPE',
-            'public_profile,email,business_management,ads_read,pages_read_engagement,instagram_basic',
-        )
-        or ''
-    ).strip()
-
-    params = {
-        'client_id': app_id,
-        'redirect_uri': redirect_uri,
-        'response_type': 'code',
-    }
-
-    oauth_state = secrets.token_urlsafe(32)
-    request.session['facebook_oauth_state'] = oauth_state
+    redirect_uri = _callback_uri(request)
 
+    state_payload = {'n': secrets.token_urlsafe(16), 'u': request.user.pk}
     next_url = str(request.GET.get('next') or '').strip()
-    if _is_absolute_http_url(next_url):
-        request.session['facebook_oauth_next'] = next_url
-        request.session['facebook_oauth_target_origin'] = _origin_from_url(next_url)
-    else:
-        request.session.pop('facebook_oauth_next', None)
-        request.session.pop('facebook_oauth_target_origin', None)
-
-    request.session['facebook_oauth_popup'] = str(request.GET.get('popup') or '').strip() in {'1', 'true', 'yes'}
-
-    params['state'] = oauth_state
-
-    if scope:
-        params['scope'] = scope
-
-    oauth_url = f"https://www.facebook.com/{graph_version}/dialog/oauth?{urlencode(params)}"
+    if _allowed_origin(next_url):
+        state_payload['next'] = next_url
+    if str(request.GET.get('popup') or '').strip() in {'1', 'true', 'yes'}:
+        state_payload['popup'] = True
+
+    # Signed state is URL-safe base64 plus ':', so only redirect_uri needs quoting.
+    state = signing.dumps(state_payload, salt=OAUTH_STATE_SALT, compress=True)
+    oauth_url = f"{oauth_settings.dialog_url_prefix}&redirect_uri={quote(redirect_uri, safe='')}&state={state}"
     return HttpResponseRedirect(oauth_url)
 
 
-@require_GET
-@login_required
 def facebook_login_callback(request):
-    expected_state = str(request.session.pop('facebook_oauth_state', '') or '').strip()
-    received_state = str(request.GET.get('state') or '').strip()
+    rejected = _reject_oauth_request(request)
+    if rejected is not None:
+        return rejected
 
-    if not expected_state or not received_state or not secrets.compare_digest(expected_state, received_state):
+    oauth_state = _load_oauth_state(request)
+    if oauth_state is None:
         return _redirect_with_oauth_result(
             request,
+            {},
             connected=False,
             error_message='State OAuth invalido ou expirado.',
         )
@@ -187,44 +334,41 @@ def facebook_login_callback(request):
     if not code:
         error_description = str(request.GET.get('error_description') or '').strip()
         detail = error_description or 'Parametro code nao encontrado no callback OAuth.'
-        return _redirect_with_oauth_result(request, connected=False, error_message=detail)
+        return _redirect_with_oauth_result(request, oauth_state, connected=False, error_message=detail)
 
-    app_id = str(getattr(settings, 'META_APP_ID', '') or '').strip()
-    app_secret = str(getattr(settings, 'META_APP_SECRET', '') or '').strip()
-    if not app_id or not app_secret:
+    oauth_settings = get_oauth_settings()
+    if not oauth_settings.app_id or not oauth_settings.app_secret:
         return _redirect_with_oauth_result(
             request,
+            oauth_state,
             connected=False,
             error_message='META_APP_ID e META_APP_SECRET precisam estar configurados no backend.',
         )
 
-    graph_version = str(getattr(settings, 'META_GRAPH_VERSION', 'v24.0') or 'v24.0').strip('/')
-    redirect_uri = request.build_absolute_uri(reverse('facebook-login-callback'))
-    token_url = f'https://graph.facebook.com/{graph_version}/oauth/access_token'
+    redirect_uri = _callback_uri(request)
     token_params = {
-        'client_id': app_id,
-        'client_secret': app_secret,
+        'client_id': oauth_settings.app_id,
+        'client_secret': oauth_settings.app_secret,
         'redirect_uri': redirect_uri,
         'code': code,
     }
 
     try:
-        token_response = requests.get(token_url, params=token_params, timeout=30)
+        token_response = graph_session.get(oauth_settings.token_url, params=token_params, timeout=30)
     except requests.RequestException as exc:
         return _redirect_with_oauth_result(
             request,
+            oauth_state,
             connected=False,
             error_message=f'Falha de rede ao obter short token: {exc}',
         )
 
-    try:
-        token_payload = token_response.json()
-    except ValueError:
-        token_payload = {}
+    token_payload = response_json(token_response)
 
     if token_response.status_code >= 400:
         return _redirect_with_oauth_result(
             request,
+            oauth_state,
             connected=False,
             error_message=_meta_error_message(
                 token_payload,
@@ -236,95 +380,98 @@ def facebook_login_callback(request):
     if not short_token:
         return _redirect_with_oauth_result(
             request,
+            oauth_state,
             connected=False,
             error_message='Facebook nao retornou access_token na troca do code.',
         )
 
-    me_url = f'https://graph.facebook.com/{graph_version}/me'
-    me_params = {
-        'fields': 'id,name',
-        'access_token': short_token,
-    }
-    try:
-        me_response = requests.get(me_url, params=me_params, timeout=30)
-    except requests.RequestException as exc:
-        return _redirect_with_oauth_result(
-            request,
-            connected=False,
-            error_message=f'Falha de rede ao consultar /me no Facebook: {exc}',
+    # The long-token exchange only needs the short token, so it runs while /me is fetched.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        exchange_future = executor.submit(
+            exchange_short_token_for_long_token,
+            short_token=short_token,
+            graph_version=oauth_settings.graph_version,
         )
+        id_meta_user, me_error = _fetch_meta_user_id(me_url=oauth_settings.me_url, short_token=short_token)
+        if me_error:
+            return _redirect_with_oauth_result(request, oauth_state, connected=False, error_message=me_error)
 
-    try:
-        me_payload = me_response.json()
-    except ValueError:
-        me_payload = {}
-
-    if me_response.status_code >= 400:
-        return _redirect_with_oauth_result(
-            request,
-            connected=False,
-            error_message=_meta_error_message(
-                me_payload,
-                'Falha ao obter dados do usuario em /me.',
-            ),
-        )
+        try:
+            exchange = exchange_future.result()
+        except MetaTokenExchangeError as exc:
+            return _redirect_with_oauth_result(
+                request,
+                oauth_state,
+                connected=False,
+                error_message=exc.detail,
+            )
 
-    id_meta_user = str(me_payload.get('id') or '').strip()
-    if not id_meta_user:
-        return _redirect_with_oauth_result(
-            request,
-            connected=False,
-            error_message='Facebook /me nao retornou id do usuario.',
-        )
+    long_token = exchange['long_token']
+    expired_at = exchange['expired_at']
 
+    # id_meta_user is unique, so the database rejects a Meta user already linked to someone else.
     try:
-        exchange = exchange_short_token_for_long_token(short_token=short_token, graph_version=graph_version)
-    except MetaTokenExchangeError as exc:
+        # A reconnect is a single conditional UPDATE; only a first connection needs the INSERT.
+        with transaction.atomic():
+            updated = DashboardUser.objects.filter(user=request.user).update(
+                id_meta_user=id_meta_user,
+                long_access_token=long_token,
+                expired_at=expired_at,
+            )
+            if not updated:
+                DashboardUser.objects.create(
+                    user=request.user,
+                    id_meta_user=id_meta_user,
+                    long_access_token=long_token,
+                    expired_at=expired_at,
+                )
+    except IntegrityError:
         return _redirect_with_oauth_result(
             request,
+            oauth_state,
             connected=False,
-            error_message=exc.detail,
-        )
-
-    long_token = exchange['long_token']
-    expired_at = exchange['expired_at']
-
-    with transaction.atomic():
-        already_linked = (
-            DashboardUser.objects.select_for_update()
-            .filter(id_meta_user=id_meta_user)
-            .exclude(user=request.user)
-            .exists()
+            error_message='id_meta_user ja conectado a outro usuario do sistema.',
         )
-        if already_linked:
-            return _redirect_with_oauth_result(
-                request,
-                connected=False,
-                error_message='id_meta_user ja conectado a outro usuario do sistema.',
-            )
-
-        dashboard_user, _ = DashboardUser.objects.select_for_update().get_or_create(
-            user=request.user,
-            defaults={
-                'id_meta_user': id_meta_user,
-                'long_access_token': long_token,
-                'expired_at': expired_at,
-            },
-        )
-        dashboard_user.id_meta_user = id_meta_user
-        dashboard_user.long_access_token = long_token
-        dashboard_user.expired_at = expired_at
-        dashboard_user.save(update_fields=['id_meta_user', 'long_access_token', 'expired_at'])
 
     return _redirect_with_oauth_result(
         request,
+        oauth_state,
         connected=True,
     )
 
 
-@require_GET
-def privacy_policy(request):
-    html = """<!doctype html>
+class _StaticPage(NamedTuple):
+    body: bytes
+    gzipped: bytes
+    etag: str
+
+
+_ACCEPTS_GZIP_RE = re.compile(r'\bgzip\b')
+
+
+def _static_page(html: str) -> _StaticPage:
+    body = html.encode('utf-8')
+    # A weak ETag, because the identity and gzip bodies differ byte for byte but carry the same page.
+    return _StaticPage(
+        body=body,
+        gzipped=gzip.compress(body, compresslevel=9, mtime=0),
+        etag=f'W/"{hashlib.sha256(body).hexdigest()[:32]}"',
+    )
+
+
+def _static_page_response(request, page: _StaticPage):
+    use_gzip = bool(_ACCEPTS_GZIP_RE.search(request.META.get('HTTP_ACCEPT_ENCODING', '')))
+    response = HttpResponse(page.gzipped if use_gzip else page.body)
+    if use_gzip:
+        response.headers['Content-Encoding'] = 'gzip'
+    response.headers['ETag'] = page.etag
+    patch_vary_headers(response, ('Accept-Encoding',))
+    patch_cache_control(response, public=True, max_age=STATIC_PAGE_MAX_AGE_SECONDS)
+    return get_conditional_response(request, etag=page.etag, response=response)
+
+
+# Both legal pages are static, so they are encoded and compressed once at import.
+_PRIVACY_POLICY_PAGE = _static_page("""<!doctype html>
 <html lang="pt-BR">
   <head>
     <meta charset="utf-8" />
@@ -469,13 +616,9 @@ def privacy_policy(request):
       </ul>
     </main>
   </body>
-</html>"""
-    return HttpResponse(html)
+</html>""")
 
-
-@require_GET
-def data_deletion(request):
-    html = """<!doctype html>
+_DATA_DELETION_PAGE = _static_page("""<!doctype html>
 <html lang="pt-BR">
   <head>
     <meta charset="utf-8" />
@@ -524,5 +667,14 @@ def data_deletion(request):
       <p>Em caso de duvidas sobre exclusao de dados: <strong>vitortramontin@gmail.com</strong></p>
     </main>
   </body>
-</html>"""
-    return HttpResponse(html)
+</html>""")
+
+
+@require_GET
+def privacy_policy(request):
+    return _static_page_response(request, _PRIVACY_POLICY_PAGE)
+
+
+@require_GET
+def data_deletion(request):
+    return _static_page_response(request, _DATA_DELETION_PAGE)